@@ -19,12 +19,19 @@ This script:
 
 Usage:
     python cbc_component_analyzer.py <primary_loinc_code> <output_name> [--exclude-specimens <specimen_sctids>]
+    python cbc_component_analyzer.py --batch <concepts.csv> [--processes N]
 
 Examples:
     python cbc_component_analyzer.py 26453-1 erythrocytes
     python cbc_component_analyzer.py 26515-7 platelets --exclude-specimens 119361006
     python cbc_component_analyzer.py 2160-0 creatinine --exclude-specimens "122575003,122556008"
 
+Batch mode:
+    The CSV needs the columns primary_loinc, output_name, exclude_specimens
+    (comma-separated SCTIDs, may be empty). Concepts are analyzed in parallel
+    worker processes; the relationship index and Excel caches are prepared
+    once in the parent process first.
+
 Specimen exclusion examples:
     - 122556008: Cord blood specimen
     - 119361006: Plasma specimen
@@ -33,9 +40,11 @@ Specimen exclusion examples:
 
 import sys
 import os
-import json
+import csv
 import asyncio
+import functools
 import argparse
+import multiprocessing
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -49,7 +58,10 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'scripts'))
 from ecl_permutation_analyzer_simple import load_loinc_mappings, execute_ecl_query
 from terminology_server_adapters import create_adapter
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
+from snomed_rf2_index import load_relationship_index, load_attribute_index
+from excel_loader import read_excel_cached
+from json_io import dump_json
 
 # Configuration
 LOINC_SNOMED_MAPPING_PATH = os.getenv('loinc_snomed_mapping_path')
@@ -72,34 +84,45 @@ DIRECT_SITE_ATTRIBUTE_ID = "704327008"
 MEASUREMENT_PROPERTY_SCTID = "685451010000100"
 MEASUREMENT_PROPERTY_LABEL = "Measurement property (qualifier value)"
 
+@functools.lru_cache(maxsize=1)
+def _reverse_index(mapping_path):
+    """
+    Load LOINC-SNOMED mappings together with a LOINC -> SNOMED reverse index.
+
+    Cached so that repeated analyses in one process (e.g. batch runs) parse the
+    mapping file and build the reverse index only once.
+
+    Returns:
+        tuple (loinc_mappings, loinc_to_snomed)
+    """
+    loinc_mappings = load_loinc_mappings(mapping_path)
+    loinc_to_snomed = {data['loinc_code']: sctid for sctid, data in loinc_mappings.items() if data.get('loinc_code')}
+    return loinc_mappings, loinc_to_snomed
+
+@functools.lru_cache(maxsize=4)
+def _get_adapter(server_type):
+    """Return a terminology server adapter, reused across analyses in one process."""
+    return create_adapter(server_type)
+
+def reset_caches():
+    """Clear cached adapters, mappings and the relationship index (e.g. after data updates)."""
+    _get_adapter.cache_clear()
+    _reverse_index.cache_clear()
+    load_relationship_index.cache_clear()
+    load_attribute_index.cache_clear()
+
 def load_snomed_attributes(relationship_file, concept_id):
     """
     Extract Component, Property, and Direct site attributes for a SNOMED concept.
 
+    Uses the cached attribute index built from the relationship index (Parquet
+    sidecar next to the RF2 file), so only the first call in a process - or
+    the first run after a new snapshot - has to parse the relationship file.
+
     Returns:
         dict with 'component', 'property', 'direct_site' keys
     """
-    attributes = {}
-
-    with open(relationship_file, 'r', encoding='utf-8') as f:
-        next(f)  # Skip header
-        for line in f:
-            parts = line.strip().split('\t')
-            if len(parts) >= 5:
-                active = parts[2]
-                source_id = parts[4]
-                type_id = parts[7]
-                destination_id = parts[5]
-
-                if active == '1' and source_id == concept_id:
-                    if type_id == COMPONENT_ATTRIBUTE_ID:
-                        attributes['component'] = destination_id
-                    elif type_id == PROPERTY_ATTRIBUTE_ID:
-                        attributes['property'] = destination_id
-                    elif type_id == DIRECT_SITE_ATTRIBUTE_ID:
-                        attributes['direct_site'] = destination_id
-
-    return attributes
+    return dict(load_attribute_index(relationship_file).get(concept_id, {}))
 
 def run_ecl_experiment(ecl_name, ecl_expression, loinc_mappings, adapter):
     """
@@ -108,26 +131,88 @@ def run_ecl_experiment(ecl_name, ecl_expression, loinc_mappings, adapter):
     Returns:
         dict with 'loinc_codes', 'snomed_concept_count', 'execution_time'
     """
-    print(f"    ECL: {ecl_expression}")
+    print(f"    [{ecl_name}] ECL: {ecl_expression}")
     result = execute_ecl_query(ecl_expression, loinc_mappings, limit=1000, server_adapter=adapter)
 
-    # Extract LOINC codes
-    loinc_codes = []
-    for concept in result.get('detailed_concepts', []):
-        if concept.get('loinc_code'):
-            loinc_codes.append(concept['loinc_code'])
-
-    loinc_codes = list(set(loinc_codes))
+    # Extract unique LOINC codes (sorted for reproducible output)
+    loinc_codes = sorted({c['loinc_code'] for c in result.get('detailed_concepts', ()) if c.get('loinc_code')})
 
-    print(f"    Result: {result.get('total', 0)} SNOMED concepts, {len(loinc_codes)} LOINC codes")
+    print(f"    [{ecl_name}] Result: {result.get('total', 0)} SNOMED concepts, {len(loinc_codes)} LOINC codes")
 
     return {
         'ecl_expression': ecl_expression,
         'loinc_codes': loinc_codes,
         'snomed_concept_count': result.get('total', 0),
-        'execution_time': result.get('execution_time', 0)
+        'execution_time': result.get('execution_time', 0),
+        # Internal: returned concepts, used to derive narrower experiments locally
+        '_concept_ids': [c['concept_id'] for c in result.get('detailed_concepts', [])]
     }
 
+def derive_ecl_experiment(ecl_name, ecl_expression, base_result, required_attributes, loinc_mappings):
+    """
+    Derive a narrower ECL experiment from an already executed broader one.
+
+    Only valid when the narrower query equals the broader one plus exact
+    attribute constraints (e.g. "Component = C" within "Component = << C").
+    Those constraints are checked against the local relationship index
+    instead of sending another query to the server.
+
+    Args:
+        base_result: run_ecl_experiment() result of the broader query
+        required_attributes: dict of attribute typeId -> required destinationId
+
+    Returns:
+        Same structure as run_ecl_experiment(), or None if the broader result
+        was truncated by the server limit and cannot be filtered reliably
+    """
+    base_concept_ids = base_result['_concept_ids']
+    if base_result['snomed_concept_count'] > len(base_concept_ids):
+        return None
+
+    df_relationships = load_relationship_index(RELATIONSHIP_FILE)
+    df_candidates = df_relationships[df_relationships['sourceId'].isin(base_concept_ids)]
+
+    concept_ids = set(base_concept_ids)
+    for type_id, destination_id in required_attributes.items():
+        mask = (df_candidates['typeId'] == type_id) & (df_candidates['destinationId'] == destination_id)
+        concept_ids &= set(df_candidates.loc[mask, 'sourceId'])
+
+    loinc_codes = sorted({
+        loinc_mappings[concept_id]['loinc_code']
+        for concept_id in concept_ids
+        if concept_id in loinc_mappings and loinc_mappings[concept_id]['loinc_code']
+    })
+
+    print(f"    [{ecl_name}] Derived locally: {len(concept_ids)} SNOMED concepts, {len(loinc_codes)} LOINC codes")
+
+    return {
+        'ecl_expression': ecl_expression,
+        'loinc_codes': loinc_codes,
+        'snomed_concept_count': len(concept_ids),
+        'execution_time': 0,
+        '_concept_ids': sorted(concept_ids)
+    }
+
+async def run_ecl_experiments(experiments, loinc_mappings, adapter):
+    """
+    Execute independent ECL experiments concurrently.
+
+    Each query is a blocking HTTP round-trip, so they run in worker threads
+    and overlap instead of waiting for each other.
+
+    Args:
+        experiments: List of (ecl_name, ecl_expression) tuples
+
+    Returns:
+        dict mapping ecl_name to run_ecl_experiment() result, in input order
+    """
+    async def _run(ecl_name, ecl_expression):
+        result = await asyncio.to_thread(run_ecl_experiment, ecl_name, ecl_expression, loinc_mappings, adapter)
+        return ecl_name, result
+
+    results = await asyncio.gather(*[_run(name, expression) for name, expression in experiments])
+    return dict(results)
+
 def analyze_cbc_component(primary_loinc, component_name, exclude_specimens=None):
     """
     Run comprehensive ECL analysis for any LOINC concept.
@@ -158,12 +243,10 @@ def analyze_cbc_component(primary_loinc, component_name, exclude_specimens=None)
         print("ERROR: loinc_snomed_mapping_path not found in environment")
         sys.exit(1)
 
-    loinc_mappings = load_loinc_mappings(LOINC_SNOMED_MAPPING_PATH)
+    loinc_mappings, loinc_to_snomed = _reverse_index(LOINC_SNOMED_MAPPING_PATH)
     print(f"  [OK] Loaded {len(loinc_mappings)} mappings")
 
     # Get SNOMED concept ID for primary LOINC
-    loinc_to_snomed = {data['loinc_code']: sctid for sctid, data in loinc_mappings.items() if data.get('loinc_code')}
-
     if primary_loinc not in loinc_to_snomed:
         print(f"ERROR: Primary LOINC {primary_loinc} not found in SNOMED mappings")
         sys.exit(1)
@@ -183,76 +266,86 @@ def analyze_cbc_component(primary_loinc, component_name, exclude_specimens=None)
 
     # Load Interpolar reference data
     print("\n[STEP 3/7] Loading Interpolar reference data...")
-    df_interpolar = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
-    df_quant = df_interpolar[df_interpolar['COMPARABILITY_TO_LOINC_PRIMARY'] == '1 - quantitativ'].copy()
+    df_interpolar = read_excel_cached(
+        INPUT_EXCEL,
+        sheet_name='LOINC Mapping Interpolar',
+        header=18,
+        usecols=['LOINC', 'LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY']
+    )
+    quant_mask = (
+        (df_interpolar['COMPARABILITY_TO_LOINC_PRIMARY'] == '1 - quantitativ')
+        & (df_interpolar['LOINC_PRIMARY'] == primary_loinc)
+    )
 
-    interpolar_codes = set(df_quant[df_quant['LOINC_PRIMARY'] == primary_loinc]['LOINC'].dropna().unique())
+    interpolar_codes = set(df_interpolar.loc[quant_mask, 'LOINC'].dropna().unique())
     interpolar_codes.add(primary_loinc)  # Include primary itself
     print(f"  [OK] Found {len(interpolar_codes)} Interpolar codes for {primary_loinc}")
 
     # Load LOINC300 data
-    df_top300 = pd.read_excel(TOP300_XLSX)
-    loinc300_codes = set(df_top300['primär'].dropna().unique()) | set(df_top300['sekundär'].dropna().unique())
+    df_top300 = read_excel_cached(TOP300_XLSX, usecols=['primär', 'sekundär'])
+    loinc300_codes = set(pd.concat([df_top300['primär'], df_top300['sekundär']]).dropna().unique())
     print(f"  [OK] Loaded {len(loinc300_codes)} LOINC300 codes")
 
     # Connect to terminology server
     print("\n[STEP 4/7] Connecting to terminology server...")
-    adapter = create_adapter('loincsnomed')
+    adapter = _get_adapter('loincsnomed')
     print("  [OK] Connected to LOINCSNOMED Snowstorm")
 
-    # Run ECL experiments
+    # Plan ECL experiments; they are independent, so they run concurrently below
     print(f"\n[STEP 5/7] Running ECL experiments...")
-    ecl_results = {}
+    experiment_order = [
+        'ecl_descendants_baseline', 'ecl_fixed_component', 'ecl_component_descendants',
+        'ecl_fixed_component_property', 'ecl_fixed_component_system',
+        'refined_with_exclusions', 'refined_base', 'precoord_descendants'
+    ]
+    experiments = []
+    derived_experiments = []
 
     # 1. ECL Descendants Baseline (if has Component attribute)
     if attributes.get('component'):
         print("\n  [1/7] ECL Descendants Baseline (<< Component)")
-        ecl_results['ecl_descendants_baseline'] = run_ecl_experiment(
+        experiments.append((
             'ecl_descendants_baseline',
-            f"<< {attributes['component']}",
-            loinc_mappings,
-            adapter
-        )
+            f"<< {attributes['component']}"
+        ))
 
     # 2. ECL Fixed Component (if has Component attribute)
+    # Subset of Exp 3 with Component = C exactly - derived locally from its result
     if attributes.get('component'):
-        print("\n  [2/7] ECL Fixed Component")
-        ecl_results['ecl_fixed_component'] = run_ecl_experiment(
+        print("\n  [2/7] ECL Fixed Component (derived from Component Descendants)")
+        derived_experiments.append((
             'ecl_fixed_component',
             f"<< 363787002 |Observable entity| : 246093002 |Component| = {attributes['component']}",
-            loinc_mappings,
-            adapter
-        )
+            'ecl_component_descendants',
+            {COMPONENT_ATTRIBUTE_ID: attributes['component']}
+        ))
 
     # 3. ECL Component Descendants (if has Component attribute)
     if attributes.get('component'):
         print("\n  [3/7] ECL Component Descendants")
-        ecl_results['ecl_component_descendants'] = run_ecl_experiment(
+        experiments.append((
             'ecl_component_descendants',
-            f"<< 363787002 |Observable entity| : 246093002 |Component| = << {attributes['component']}",
-            loinc_mappings,
-            adapter
-        )
+            f"<< 363787002 |Observable entity| : 246093002 |Component| = << {attributes['component']}"
+        ))
 
     # 4. ECL Fixed Component Property (if has both)
+    # Subset of Exp 3 with exact Component and Property - derived locally from its result
     if attributes.get('component') and attributes.get('property'):
-        print("\n  [4/7] ECL Fixed Component Property")
-        ecl_results['ecl_fixed_component_property'] = run_ecl_experiment(
+        print("\n  [4/7] ECL Fixed Component Property (derived from Component Descendants)")
+        derived_experiments.append((
             'ecl_fixed_component_property',
             f"<< 363787002 |Observable entity| : 246093002 |Component| = {attributes['component']}, 370130000 |Property| = {attributes['property']}",
-            loinc_mappings,
-            adapter
-        )
+            'ecl_component_descendants',
+            {COMPONENT_ATTRIBUTE_ID: attributes['component'], PROPERTY_ATTRIBUTE_ID: attributes['property']}
+        ))
 
     # 5. ECL Fixed Component System (if has component and direct site)
     if attributes.get('component') and attributes.get('direct_site'):
         print("\n  [5/7] ECL Fixed Component System")
-        ecl_results['ecl_fixed_component_system'] = run_ecl_experiment(
+        experiments.append((
             'ecl_fixed_component_system',
-            f"<< 363787002 |Observable entity| : 246093002 |Component| = {attributes['component']}, 704327008 |Direct site| = << {attributes['direct_site']}",
-            loinc_mappings,
-            adapter
-        )
+            f"<< 363787002 |Observable entity| : 246093002 |Component| = {attributes['component']}, 704327008 |Direct site| = << {attributes['direct_site']}"
+        ))
 
     # 6. Refined Query: With specimen exclusions (if has all three attributes)
     # Uses universal Measurement property to capture all quantitative variations
@@ -272,12 +365,7 @@ def analyze_cbc_component(primary_loinc, component_name, exclude_specimens=None)
         for specimen_id in exclude_specimens:
             excl_ecl += f",\n    704327008 |Direct site| != << {specimen_id}"
 
-        ecl_results['refined_with_exclusions'] = run_ecl_experiment(
-            'refined_with_exclusions',
-            excl_ecl,
-            loinc_mappings,
-            adapter
-        )
+        experiments.append(('refined_with_exclusions', excl_ecl))
 
     # 7. Refined Query: Base (no exclusions) - always run for comparison
     # Uses universal Measurement property to capture all quantitative variations
@@ -288,34 +376,43 @@ def analyze_cbc_component(primary_loinc, component_name, exclude_specimens=None)
     370130000 |Property| = << {MEASUREMENT_PROPERTY_SCTID} |{MEASUREMENT_PROPERTY_LABEL}|,
     704327008 |Direct site| = << {attributes['direct_site']}"""
 
-        ecl_results['refined_base'] = run_ecl_experiment(
-            'refined_base',
-            base_ecl,
-            loinc_mappings,
-            adapter
-        )
+        experiments.append(('refined_base', base_ecl))
 
     # 8. Pre-coordinated Descendants (fallback for calculated indices)
     if not attributes.get('component'):
         print("\n  [1/1] Pre-coordinated Descendants")
-        ecl_results['precoord_descendants'] = run_ecl_experiment(
+        experiments.append((
             'precoord_descendants',
-            f"<< {snomed_concept_id}",
-            loinc_mappings,
-            adapter
-        )
+            f"<< {snomed_concept_id}"
+        ))
+
+    print(f"\n  Executing {len(experiments)} ECL queries concurrently...")
+    ecl_results = asyncio.run(run_ecl_experiments(experiments, loinc_mappings, adapter))
+
+    for ecl_name, ecl_expression, base_name, required_attributes in derived_experiments:
+        result = derive_ecl_experiment(ecl_name, ecl_expression, ecl_results[base_name], required_attributes, loinc_mappings)
+        if result is None:
+            print(f"    [{ecl_name}] {base_name} result truncated - querying server")
+            result = run_ecl_experiment(ecl_name, ecl_expression, loinc_mappings, adapter)
+        ecl_results[ecl_name] = result
+
+    ecl_results = {name: ecl_results[name] for name in experiment_order if name in ecl_results}
+
+    # Set view of each result for membership tests (stripped before JSON output)
+    for exp_data in ecl_results.values():
+        exp_data['_loinc_set'] = frozenset(exp_data['loinc_codes'])
 
     # Collect all LOINC codes found across all experiments
     print("\n[STEP 6/7] Collecting and analyzing results...")
     all_loinc_codes = set()
     for exp_name, exp_data in ecl_results.items():
-        all_loinc_codes.update(exp_data['loinc_codes'])
+        all_loinc_codes.update(exp_data['_loinc_set'])
 
     print(f"  Total unique LOINC codes found: {len(all_loinc_codes)}")
 
     # Fetch LOINC display names
     print(f"  Fetching display names for {len(all_loinc_codes)} LOINC codes...")
-    loinc_displays = asyncio.run(fetch_displays_async(sorted(all_loinc_codes), verbose=False, max_concurrent=15))
+    loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(all_loinc_codes), verbose=False, max_concurrent=15))
 
     # Determine refined query approach (Component + Property + Direct site)
     # This is the most specific technical definition, not a quality judgment
@@ -333,42 +430,63 @@ def analyze_cbc_component(primary_loinc, component_name, exclude_specimens=None)
         print(f"\n  Refined query approach: {refined_approach} ({len(refined_codes)} codes)")
 
     # Build comprehensive comparison table
-    comparison_rows = []
-
-    for loinc_code in sorted(all_loinc_codes):
-        row = {
-            'LOINC_Code': loinc_code,
-            'LOINC_Display': loinc_displays.get(loinc_code, f'LOINC {loinc_code}'),
-            'Is_Primary': 'Yes' if loinc_code == primary_loinc else '',
-            'In_Interpolar': 'Yes' if loinc_code in interpolar_codes else '',
-            'In_LOINC300': 'Yes' if loinc_code in loinc300_codes else ''
-        }
-
-        # Add presence in each ECL experiment
-        for exp_name, exp_data in ecl_results.items():
-            row[f'{exp_name}_Present'] = 'Yes' if loinc_code in exp_data['loinc_codes'] else ''
+    # One boolean column per flag, computed with vectorized isin() lookups
+    loinc_index = pd.Index(sorted(all_loinc_codes), name='LOINC_Code')
+    df_comparison = pd.DataFrame({
+        'LOINC_Code': loinc_index,
+        'LOINC_Display': [loinc_displays.get(code, f'LOINC {code}') for code in loinc_index],
+        'Is_Primary': loinc_index == primary_loinc,
+        'In_Interpolar': loinc_index.isin(interpolar_codes),
+        'In_LOINC300': loinc_index.isin(loinc300_codes)
+    })
+
+    # Add presence in each ECL experiment
+    present_columns = []
+    for exp_name, exp_data in ecl_results.items():
+        column = f'{exp_name}_Present'
+        df_comparison[column] = loinc_index.isin(exp_data['_loinc_set'])
+        present_columns.append(column)
 
-        # Add "Refined_Query" flag for codes found by most specific query
-        # This is a technical designation (Component + Property + Direct site), not a clinical judgment
-        if refined_approach and loinc_code in ecl_results[refined_approach]['loinc_codes']:
-            row['Refined_Query'] = 'Yes'
-        else:
-            row['Refined_Query'] = ''
+    # Add "Refined_Query" flag for codes found by most specific query
+    # This is a technical designation (Component + Property + Direct site), not a clinical judgment
+    if refined_approach:
+        df_comparison['Refined_Query'] = loinc_index.isin(ecl_results[refined_approach]['_loinc_set'])
+    else:
+        df_comparison['Refined_Query'] = False
 
-        # Count how many approaches found this code
-        approach_count = sum(1 for key, val in row.items() if key.endswith('_Present') and val == 'Yes')
-        if row['In_Interpolar'] == 'Yes':
-            approach_count += 1
-        row['Approach_Count'] = approach_count
+    # Count how many approaches found this code
+    df_comparison['Approach_Count'] = (
+        df_comparison[present_columns].sum(axis=1) + df_comparison['In_Interpolar'].astype(int)
+    )
 
-        comparison_rows.append(row)
+    # Per-experiment metrics vs Interpolar, aggregated from the same boolean columns
+    df_metrics = pd.DataFrame({
+        'count': df_comparison[present_columns].sum().to_numpy(),
+        'overlap': df_comparison.loc[df_comparison['In_Interpolar'], present_columns].sum().to_numpy()
+    }, index=list(ecl_results))
+    df_metrics['precision'] = (df_metrics['overlap'] / df_metrics['count']).fillna(0)
+    df_metrics['recall'] = df_metrics['overlap'] / len(interpolar_codes)
+    df_metrics['f1'] = (
+        2 * df_metrics['precision'] * df_metrics['recall'] / (df_metrics['precision'] + df_metrics['recall'])
+    ).fillna(0)
 
-    df_comparison = pd.DataFrame(comparison_rows)
     df_comparison = df_comparison.sort_values(['Approach_Count', 'LOINC_Code'], ascending=[False, True])
 
-    # Save comparison CSV
+    # Save comparison CSV - rows are streamed, flags written as 'Yes'/''
     comparison_csv = output_dir / f'{component_name.lower()}_ecl_comparison.csv'
-    df_comparison.to_csv(comparison_csv, index=False)
+    fieldnames = list(df_comparison.columns)
+    flag_columns = {'Is_Primary', 'In_Interpolar', 'In_LOINC300', *present_columns, 'Refined_Query'}
+
+    with open(comparison_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(
+            {
+                column: ('Yes' if value else '') if column in flag_columns else value
+                for column, value in zip(fieldnames, row)
+            }
+            for row in df_comparison.itertuples(index=False, name=None)
+        )
     print(f"  [OK] Saved: {comparison_csv}")
 
     # Save detailed results JSON
@@ -378,35 +496,31 @@ def analyze_cbc_component(primary_loinc, component_name, exclude_specimens=None)
         'component_name': component_name,
         'snomed_concept_id': snomed_concept_id,
         'attributes': attributes,
-        'experiments': ecl_results,
+        'experiments': {
+            name: {key: value for key, value in exp_data.items() if not key.startswith('_')}
+            for name, exp_data in ecl_results.items()
+        },
         'summary': {
             'total_loinc_codes': len(all_loinc_codes),
             'interpolar_codes': len(interpolar_codes),
-            'loinc300_codes': len([c for c in all_loinc_codes if c in loinc300_codes])
+            'loinc300_codes': len(all_loinc_codes & loinc300_codes),
+            'per_experiment_metrics': df_metrics.round(3).to_dict(orient='index')
         }
     }
 
     results_json_file = output_dir / f'{component_name.lower()}_ecl_results.json'
-    with open(results_json_file, 'w', encoding='utf-8') as f:
-        json.dump(results_json, f, indent=2, ensure_ascii=False)
+    dump_json(results_json, results_json_file)
     print(f"  [OK] Saved: {results_json_file}")
 
-    # Calculate statistics vs Interpolar
+    # Report statistics vs Interpolar (computed with the comparison table)
     print("\n[STEP 7/7] Calculating statistics vs Interpolar...")
 
-    for exp_name, exp_data in ecl_results.items():
-        exp_codes = set(exp_data['loinc_codes'])
-        overlap = exp_codes & interpolar_codes
-
-        precision = len(overlap) / len(exp_codes) if exp_codes else 0
-        recall = len(overlap) / len(interpolar_codes) if interpolar_codes else 0
-        f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
-
+    for exp_name, metrics in df_metrics.iterrows():
         print(f"\n  {exp_name}:")
-        print(f"    Codes: {len(exp_codes)}")
-        print(f"    Precision: {precision:.3f}")
-        print(f"    Recall: {recall:.3f}")
-        print(f"    F1: {f1:.3f}")
+        print(f"    Codes: {int(metrics['count'])}")
+        print(f"    Precision: {metrics['precision']:.3f}")
+        print(f"    Recall: {metrics['recall']:.3f}")
+        print(f"    F1: {metrics['f1']:.3f}")
 
     # Complete
     print("\n" + "=" * 80)
@@ -419,6 +533,89 @@ def analyze_cbc_component(primary_loinc, component_name, exclude_specimens=None)
 
     return output_dir, df_comparison
 
+def _parse_specimens(value):
+    """Split a comma-separated list of specimen SCTIDs."""
+    return [s.strip() for s in (value or '').split(',') if s.strip()]
+
+def _run_one(task):
+    """
+    Pool worker: analyze one concept from a batch file.
+
+    analyze_cbc_component() exits on fatal errors; SystemExit is caught here so
+    a failing concept does not take down its worker process.
+
+    Returns:
+        tuple (primary_loinc, output_name, success)
+    """
+    primary_loinc, output_name, exclude_specimens = task
+    try:
+        analyze_cbc_component(primary_loinc, output_name, exclude_specimens)
+        return primary_loinc, output_name, True
+    except (Exception, SystemExit) as e:
+        print(f"ERROR: Analysis of {primary_loinc} ({output_name}) failed: {e}")
+        return primary_loinc, output_name, False
+
+def run_batch(batch_file, processes=None):
+    """
+    Analyze all concepts listed in a CSV file using a process pool.
+
+    The relationship index, LOINC mappings and Excel Parquet caches are built
+    in the parent first, so workers find warm sidecar files instead of all
+    parsing the same inputs at once (and forked workers inherit the in-memory
+    caches).
+
+    Args:
+        batch_file: CSV with columns primary_loinc, output_name, exclude_specimens
+        processes: Number of worker processes (default: CPU count)
+
+    Returns:
+        List of (primary_loinc, output_name, success) tuples
+    """
+    tasks = []
+    with open(batch_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        missing_columns = {'primary_loinc', 'output_name'} - set(reader.fieldnames or [])
+        if missing_columns:
+            print(f"ERROR: {batch_file} is missing column(s): {', '.join(sorted(missing_columns))}")
+            sys.exit(1)
+
+        for row in reader:
+            primary_loinc = (row.get('primary_loinc') or '').strip()
+            output_name = (row.get('output_name') or '').strip()
+            if not primary_loinc and not output_name:
+                continue
+            if not primary_loinc or not output_name:
+                print(f"  [SKIP] Line {reader.line_num}: primary_loinc and output_name are both required")
+                continue
+            tasks.append((primary_loinc, output_name, _parse_specimens(row.get('exclude_specimens'))))
+
+    if not tasks:
+        print(f"ERROR: No concepts found in {batch_file}")
+        sys.exit(1)
+
+    if not LOINC_SNOMED_MAPPING_PATH:
+        print("ERROR: loinc_snomed_mapping_path not found in environment")
+        sys.exit(1)
+
+    print(f"Preparing shared caches for {len(tasks)} concepts...")
+    load_attribute_index(RELATIONSHIP_FILE)
+    _reverse_index(LOINC_SNOMED_MAPPING_PATH)
+    read_excel_cached(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+    read_excel_cached(TOP300_XLSX)
+
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    print(f"Running {len(tasks)} analyses with {processes} processes...")
+
+    with multiprocessing.Pool(processes=processes) as pool:
+        results = pool.map(_run_one, tasks)
+
+    failed = [(primary, name) for primary, name, success in results if not success]
+    print(f"\n[OK] Completed {len(results) - len(failed)}/{len(results)} analyses")
+    for primary, name in failed:
+        print(f"  Failed: {primary} ({name})")
+
+    return results
+
 def main():
     parser = argparse.ArgumentParser(
         description='Analyze any LOINC concept using comprehensive ECL experiments',
@@ -434,6 +631,9 @@ Examples:
   # Creatinine (exclude urine and cord blood)
   python cbc_component_analyzer.py 2160-0 creatinine --exclude-specimens "122575003,122556008"
 
+  # Many concepts in parallel (CSV: primary_loinc,output_name,exclude_specimens)
+  python cbc_component_analyzer.py --batch concepts.csv --processes 4
+
 Common specimen SNOMED IDs:
   122556008 - Cord blood specimen
   119361006 - Plasma specimen
@@ -442,18 +642,27 @@ Common specimen SNOMED IDs:
   119339001 - Stool specimen
         """
     )
-    parser.add_argument('primary_loinc', help='Primary LOINC code')
-    parser.add_argument('output_name', help='Output directory name (e.g., erythrocytes, platelets, creatinine)')
+    parser.add_argument('primary_loinc', nargs='?', help='Primary LOINC code')
+    parser.add_argument('output_name', nargs='?', help='Output directory name (e.g., erythrocytes, platelets, creatinine)')
     parser.add_argument('--exclude-specimens',
                         help='Comma-separated list of SNOMED specimen concept IDs to exclude',
                         default='')
+    parser.add_argument('--batch',
+                        help='CSV file with columns primary_loinc, output_name, exclude_specimens')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Worker processes for --batch (default: CPU count)')
 
     args = parser.parse_args()
 
+    if args.batch:
+        failed = [r for r in run_batch(args.batch, args.processes) if not r[2]]
+        sys.exit(1 if failed else 0)
+
+    if not args.primary_loinc or not args.output_name:
+        parser.error('primary_loinc and output_name are required unless --batch is given')
+
     # Parse specimen exclusions
-    exclude_specimens = []
-    if args.exclude_specimens:
-        exclude_specimens = [s.strip() for s in args.exclude_specimens.split(',') if s.strip()]
+    exclude_specimens = _parse_specimens(args.exclude_specimens)
 
     analyze_cbc_component(args.primary_loinc, args.output_name, exclude_specimens)
 
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+CBC Component Loader
+====================
+Shared loader for the *_ecl_comparison.csv files written by
+cbc_component_analyzer.py, used by the CBC summary and HTML table scripts.
+
+Each CSV is parsed once per process (lru_cache) and additionally stored as a
+Parquet sibling (<name>_ecl_comparison.parquet) that is reused while it is
+newer than the CSV, so repeated runs skip CSV parsing.
+
+Usage:
+    from cbc_loader import load_all_components
+
+    component_dfs = load_all_components(cbc_components, OUTPUT_DIR)
+    # {'Hemoglobin': DataFrame, ...} - missing files are omitted
+
+The returned DataFrames are shared between callers and must not be modified
+in place.
+"""
+
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+# Columns of the *_ecl_comparison.csv files produced by cbc_component_analyzer.py
+CBC_FLAG_COLUMNS = [
+    'Is_Primary', 'In_Interpolar', 'In_LOINC300', 'Refined_Query',
+    'ecl_descendants_baseline_Present', 'ecl_fixed_component_Present',
+    'ecl_component_descendants_Present', 'ecl_fixed_component_property_Present',
+    'ecl_fixed_component_system_Present', 'refined_with_exclusions_Present',
+    'refined_base_Present', 'precoord_descendants_Present'
+]
+CBC_USECOLS = ['LOINC_Code', 'LOINC_Display', *CBC_FLAG_COLUMNS, 'Approach_Count']
+CBC_DTYPES = {
+    'LOINC_Code': str,
+    'LOINC_Display': str,
+    'Approach_Count': 'int32',
+    **{col: 'category' for col in CBC_FLAG_COLUMNS}
+}
+
+
+@functools.lru_cache(maxsize=None)
+def load_component(csv_path):
+    """
+    Load one component comparison table.
+
+    Args:
+        csv_path: Path to <name>_ecl_comparison.csv
+
+    Returns:
+        DataFrame with the CBC_USECOLS columns present in the file
+    """
+    csv_path = Path(csv_path)
+    parquet_path = csv_path.with_suffix('.parquet')
+
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        try:
+            return pd.read_parquet(parquet_path)
+        except ImportError as e:
+            print(f"  Warning: Cannot read {parquet_path.name} ({e}), parsing CSV")
+
+    df = pd.read_csv(csv_path, usecols=lambda col: col in CBC_USECOLS, dtype=CBC_DTYPES)
+
+    try:
+        df.to_parquet(parquet_path, index=False)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"  Warning: Could not write {parquet_path.name}: {e}")
+
+    return df
+
+
+def load_all_components(components, base_dir):
+    """
+    Load all existing component tables, parsing files in parallel threads.
+
+    Args:
+        components: dict component name -> {'dir': ..., 'csv': ...}
+        base_dir: Directory containing the component subdirectories
+
+    Returns:
+        dict component name -> DataFrame (missing files are omitted)
+    """
+    base_dir = Path(base_dir)
+    if not base_dir.is_dir():
+        return {}
+
+    # One directory listing instead of a stat per component directory
+    with os.scandir(base_dir) as entries:
+        present_dirs = {entry.name for entry in entries if entry.is_dir()}
+
+    existing = {}
+    for name, info in components.items():
+        if info['dir'] not in present_dirs:
+            continue
+        csv_path = base_dir / info['dir'] / info['csv']
+        if csv_path.is_file():
+            existing[name] = csv_path
+
+    if not existing:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=len(existing)) as executor:
+        return dict(zip(existing, executor.map(load_component, existing.values())))
@@ -13,22 +13,33 @@ Example:
 """
 
 import sys
-import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-def load_filtered_interpolar_codes():
-    """Load filtered Interpolar valuesets and extract LOINC codes per primary."""
-    PROJECT_ROOT = Path(__file__).parent.parent.parent
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+from json_io import load_json, dump_json
+
+def load_filtered_interpolar_codes(max_workers=16):
+    """Load filtered Interpolar valuesets and extract LOINC codes per primary.
+
+    Files are read and parsed in a thread pool, since each valueset is an
+    independent file. Codes are returned as sorted, unique NumPy string arrays
+    for the vectorized set operations in compare_with_filtered().
+    """
     INTERPOLAR_FILTERED_DIR = PROJECT_ROOT / 'output' / 'valuesets_interpolar_filtered'
 
+    vs_files = sorted(INTERPOLAR_FILTERED_DIR.glob('valueset-interpolar-filtered-loinc-*.json'))
+
     primary_to_codes = {}
 
-    for vs_file in INTERPOLAR_FILTERED_DIR.glob('valueset-interpolar-filtered-loinc-*.json'):
-        with open(vs_file, 'r', encoding='utf-8') as f:
-            valueset = json.load(f)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        valuesets = list(executor.map(load_json, vs_files))
 
+    for valueset in valuesets:
         # Extract primary LOINC from ID
         vs_id = valueset['id']
         primary_loinc = vs_id.replace('interpolar-filtered-loinc-', '')
@@ -38,12 +49,12 @@ def load_filtered_interpolar_codes():
             primary_loinc = primary_loinc[:-1] + '-' + primary_loinc[-1]
 
         # Extract LOINC codes
-        codes = []
-        for include in valueset.get('compose', {}).get('include', []):
-            for concept in include.get('concept', []):
-                codes.append(concept['code'])
-
-        primary_to_codes[primary_loinc] = set(codes)
+        codes = [
+            concept['code']
+            for include in valueset.get('compose', {}).get('include', [])
+            for concept in include.get('concept', [])
+        ]
+        primary_to_codes[primary_loinc] = np.unique(np.array(codes, dtype=str))
 
     return primary_to_codes
 
@@ -59,8 +70,7 @@ def compare_with_filtered(experiment_dir):
 
     # Load ECL results
     ecl_results_file = experiment_dir / 'ecl_query_results_summary.json'
-    with open(ecl_results_file, 'r', encoding='utf-8') as f:
-        ecl_results = json.load(f)
+    ecl_results = load_json(ecl_results_file)
 
     print(f"[OK] Loaded ECL results: {len(ecl_results)} primary codes")
 
@@ -76,38 +86,38 @@ def compare_with_filtered(experiment_dir):
             print(f"  [SKIP] {primary_loinc}: Not in filtered Interpolar")
             continue
 
+        # Sorted unique arrays - set operations below run in NumPy and keep the order
         interpolar_codes = filtered_interpolar[primary_loinc]
-        ecl_codes = set(ecl_data.get('loinc_codes_found', []))
+        ecl_codes = np.unique(np.array(ecl_data.get('loinc_codes_found', []), dtype=str))
 
-        overlap = interpolar_codes & ecl_codes
-        interpolar_only = interpolar_codes - ecl_codes
-        ecl_only = ecl_codes - interpolar_codes
+        overlap = np.intersect1d(interpolar_codes, ecl_codes, assume_unique=True)
+        interpolar_only = np.setdiff1d(interpolar_codes, ecl_codes, assume_unique=True)
+        ecl_only = np.setdiff1d(ecl_codes, interpolar_codes, assume_unique=True)
 
-        precision = len(overlap) / len(ecl_codes) if ecl_codes else 0
-        recall = len(overlap) / len(interpolar_codes) if interpolar_codes else 0
+        precision = overlap.size / ecl_codes.size if ecl_codes.size else 0
+        recall = overlap.size / interpolar_codes.size if interpolar_codes.size else 0
         f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
 
         comparison_results.append({
             'primary_loinc': primary_loinc,
-            'interpolar_filtered_count': len(interpolar_codes),
-            'ecl_count': len(ecl_codes),
-            'overlap_count': len(overlap),
-            'interpolar_only_count': len(interpolar_only),
-            'ecl_only_count': len(ecl_only),
+            'interpolar_filtered_count': interpolar_codes.size,
+            'ecl_count': ecl_codes.size,
+            'overlap_count': overlap.size,
+            'interpolar_only_count': interpolar_only.size,
+            'ecl_only_count': ecl_only.size,
             'precision': round(precision, 3),
             'recall': round(recall, 3),
             'f1_score': round(f1, 3),
-            'interpolar_codes': sorted(list(interpolar_codes)),
-            'ecl_codes': sorted(list(ecl_codes)),
-            'overlap_codes': sorted(list(overlap)),
-            'interpolar_only_codes': sorted(list(interpolar_only)),
-            'ecl_only_codes': sorted(list(ecl_only))
+            'interpolar_codes': interpolar_codes.tolist(),
+            'ecl_codes': ecl_codes.tolist(),
+            'overlap_codes': overlap.tolist(),
+            'interpolar_only_codes': interpolar_only.tolist(),
+            'ecl_only_codes': ecl_only.tolist()
         })
 
     # Save detailed comparison
     output_file = experiment_dir / 'comparison_interpolar_filtered_vs_ecl.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(comparison_results, f, indent=2, ensure_ascii=False)
+    dump_json(comparison_results, output_file)
 
     print(f"\n[OK] Saved: {output_file.name}")
 
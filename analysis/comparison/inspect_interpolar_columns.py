@@ -2,22 +2,31 @@
 """
 Quick script to inspect Interpolar Excel file columns
 """
-import pandas as pd
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+from excel_loader import read_excel
+
 INPUT_EXCEL = PROJECT_ROOT / 'input' / 'LOINC_Mapping_Interpolar_v3.6 an Debersthäuser 25.09.2025.xlsx'
 
-df = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+# Header-only read for the column listing
+columns = read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18, nrows=0).columns.tolist()
 
 print("Columns in the Excel file:")
-print(df.columns.tolist())
+print(columns)
 print("\n" + "="*80)
 
 # Check for comparability columns
-comp_cols = [col for col in df.columns if 'COMPARABILITY' in col.upper()]
+comp_cols = [col for col in columns if 'COMPARABILITY' in str(col).upper()]
 print(f"\nComparability columns found: {comp_cols}")
 
+# Only parse the columns used for the samples below
+sample_cols = {'LOINC', 'LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY', 'GERMAN_NAME_LOINC_PRIMARY'}
+df = read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18,
+                usecols=lambda col: col in sample_cols)
+
 # Sample values from COMPARABILITY_TO_LOINC_PRIMARY
 if 'COMPARABILITY_TO_LOINC_PRIMARY' in df.columns:
     print("\nUnique values in COMPARABILITY_TO_LOINC_PRIMARY:")
@@ -5,13 +5,51 @@ Create CBC HTML Tables
 Generates nice HTML tables for all CBC components with styling and interactivity.
 """
 
-import pandas as pd
+import sys
+import numpy as np
 from pathlib import Path
 from datetime import datetime
 
+from cbc_loader import load_all_components
+
 PROJECT_ROOT = Path(__file__).parent.parent
 OUTPUT_DIR = PROJECT_ROOT / 'output' / 'singular_concepts'
 
+
+# Constant HTML fragments for the detailed component tables
+YES_BADGE = '<span class="badge badge-yes">✓</span>'
+REFINED_BADGE = '<span class="badge badge-refined">✓</span>'
+PRIMARY_BADGE = '<span class="badge badge-yes">PRIMARY</span>'
+ECL_YES_TD = '<td><span class="badge badge-yes">✓</span></td>'
+ECL_EMPTY_TD = '<td><span class=""></span></td>'
+CENTER_TD = '<td style="text-align: center;">'
+
+# Row template for the detailed component tables, parsed once and filled per row
+ROW_TMPL = (
+    '<tr class="{row_class}">'
+    '<td><span class="loinc-code">{code}</span> {primary_badge}</td>'
+    '<td>{display}</td>'
+    + CENTER_TD + '{refined}</td>'
+    + CENTER_TD + '{interpolar}</td>'
+    + CENTER_TD + '{loinc300}</td>'
+    '{ecl_cells}'
+    + CENTER_TD + '{approach}</td>'
+    '</tr>\n'
+)
+
+
+def yes_cells(df, column, yes_html, no_html=''):
+    """
+    Map a 'Yes'/'' flag column to HTML fragments in one vectorized pass.
+
+    Returns:
+        Object array with one fragment per row (no_html if the column is missing)
+    """
+    if column not in df.columns:
+        return np.full(len(df), no_html, dtype=object)
+    return np.where(df[column].to_numpy() == 'Yes', yes_html, no_html).astype(object)
+
+
 print("=" * 80)
 print("CBC HTML TABLES GENERATOR")
 print("=" * 80)
@@ -82,14 +120,18 @@ total_codes = 0
 direct_obs_count = 0
 calc_index_count = 0
 
-for component_name, info in cbc_components.items():
-    csv_path = OUTPUT_DIR / info['dir'] / info['csv']
+loaded_dfs = load_all_components(cbc_components, OUTPUT_DIR)
+if not loaded_dfs:
+    print(f"ERROR: No component comparison files found in {OUTPUT_DIR}")
+    print("Run cbc_component_analyzer.py first.")
+    sys.exit(1)
 
-    if not csv_path.exists():
+for component_name, info in cbc_components.items():
+    if component_name not in loaded_dfs:
         print(f"  [SKIP] {component_name}: File not found")
         continue
 
-    df = pd.read_csv(csv_path)
+    df = loaded_dfs[component_name]
     components_data.append({
         'name': component_name,
         'info': info,
@@ -182,38 +224,38 @@ for comp in components_data:
     df = comp['data']
     category_class = 'calculated' if comp['info']['category'] == 'Calculated Index' else ''
 
-    # Generate table rows
-    rows = []
-    for _, row in df.iterrows():
-        is_primary = row.get('Is_Primary', '') == 'Yes'
-        row_class = 'primary-code' if is_primary else ''
-
-        primary_badge = '<span class="badge badge-yes">PRIMARY</span>' if is_primary else ''
-
-        # Build ECL result cells
-        ecl_cells = []
-        for col_name, _ in ecl_columns:
-            if col_name in df.columns:
-                value = row.get(col_name, '')
-                cell_class = 'badge badge-yes' if value == 'Yes' else ''
-                cell_content = '✓' if value == 'Yes' else ''
-                ecl_cells.append(f'<td><span class="{cell_class}">{cell_content}</span></td>')
-
-        in_interpolar = '<span class="badge badge-yes">✓</span>' if row.get('In_Interpolar', '') == 'Yes' else ''
-        in_loinc300 = '<span class="badge badge-yes">✓</span>' if row.get('In_LOINC300', '') == 'Yes' else ''
-        is_refined = '<span class="badge badge-refined">✓</span>' if row.get('Refined_Query', '') == 'Yes' else ''
-
-        rows.append(f"""
-            <tr class="{row_class}">
-                <td><span class="loinc-code">{row['LOINC_Code']}</span> {primary_badge}</td>
-                <td>{row.get('LOINC_Display', '')}</td>
-                <td style="text-align: center;">{is_refined}</td>
-                <td style="text-align: center;">{in_interpolar}</td>
-                <td style="text-align: center;">{in_loinc300}</td>
-                {''.join(ecl_cells)}
-                <td style="text-align: center;">{row.get('Approach_Count', 0)}</td>
-            </tr>
-        """)
+    # ECL columns present in this dataset
+    present_ecl = [col_name for col_name, _ in ecl_columns if col_name in df.columns]
+
+    # Precompute cell HTML column-wise instead of branching per row
+    if 'Is_Primary' in df.columns:
+        is_primary = df['Is_Primary'].to_numpy() == 'Yes'
+    else:
+        is_primary = np.zeros(len(df), dtype=bool)
+    row_classes = np.where(is_primary, 'primary-code', '')
+    primary_badges = np.where(is_primary, PRIMARY_BADGE, '')
+    in_interpolar = yes_cells(df, 'In_Interpolar', YES_BADGE)
+    in_loinc300 = yes_cells(df, 'In_LOINC300', YES_BADGE)
+    is_refined = yes_cells(df, 'Refined_Query', REFINED_BADGE)
+
+    ecl_cells = np.full(len(df), '', dtype=object)
+    for col_name in present_ecl:
+        ecl_cells = ecl_cells + yes_cells(df, col_name, ECL_YES_TD, ECL_EMPTY_TD)
+
+    displays = df['LOINC_Display'] if 'LOINC_Display' in df.columns else [''] * len(df)
+    approach_counts = df['Approach_Count'] if 'Approach_Count' in df.columns else [0] * len(df)
+
+    # Generate table rows - one template substitution over the precomputed fragments per row
+    row_fields = ('code', 'display', 'row_class', 'primary_badge', 'refined',
+                  'interpolar', 'loinc300', 'ecl_cells', 'approach')
+    format_row = ROW_TMPL.format_map
+    rows = [
+        format_row(dict(zip(row_fields, values)))
+        for values in zip(
+            df['LOINC_Code'], displays, row_classes, primary_badges,
+            is_refined, in_interpolar, in_loinc300, ecl_cells, approach_counts
+        )
+    ]
 
     # Build header for ECL columns that exist in this dataset
     ecl_headers = []
@@ -430,7 +472,7 @@ tbody tr:hover {
 }
 """
 
-final_html = f"""<!DOCTYPE html>
+html_head = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -453,8 +495,9 @@ final_html = f"""<!DOCTYPE html>
         {summary_table_html}
 
         <h2>Detailed Component Analysis</h2>
-        {''.join(components_html_parts)}
+"""
 
+html_footer = """
         <div class="footer">
             <p>Generated by CBC HTML Tables Generator</p>
             <p>LOINC-SNOMED mapping analysis for Complete Blood Count components</p>
@@ -464,10 +507,13 @@ final_html = f"""<!DOCTYPE html>
 </html>
 """
 
-# Save HTML file
+# Save HTML file - written part by part instead of joining one document string
 output_file = OUTPUT_DIR / 'cbc_components_analysis.html'
 with open(output_file, 'w', encoding='utf-8') as f:
-    f.write(final_html)
+    f.write(html_head)
+    for part in components_html_parts:
+        f.write(part)
+    f.write(html_footer)
 
 print("\n" + "=" * 80)
 print("COMPLETE!")
@@ -14,14 +14,20 @@ Includes:
 - MCV, MCH, MCHC (Erythrocyte indices)
 """
 
+import sys
 import pandas as pd
 import json
 from pathlib import Path
 from datetime import datetime
 
+from cbc_loader import load_all_components
+
 PROJECT_ROOT = Path(__file__).parent.parent
 OUTPUT_DIR = PROJECT_ROOT / 'output' / 'singular_concepts'
 
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+from table_io import write_table
+
 print("=" * 80)
 print("CBC SUMMARY TABLES GENERATOR")
 print("=" * 80)
@@ -77,83 +83,78 @@ cbc_components = {
 }
 
 # Collect all data
-all_data = []
-summary_stats = []
+summary_stats = {'Component': [], 'Category': [], 'LOINC_Count': [], 'Has_Primary': [], 'Primary_Code': []}
+comp_dfs = {}  # Loaded CSVs in component order, reused for the combined table and matrix
 
 print("Loading CBC component data...")
-for component_name, info in cbc_components.items():
-    csv_path = OUTPUT_DIR / info['dir'] / info['csv']
+loaded_dfs = load_all_components(cbc_components, OUTPUT_DIR)
+if not loaded_dfs:
+    print(f"ERROR: No component comparison files found in {OUTPUT_DIR}")
+    print("Run cbc_component_analyzer.py first.")
+    sys.exit(1)
 
-    if not csv_path.exists():
+for component_name, info in cbc_components.items():
+    if component_name not in loaded_dfs:
         print(f"  [SKIP] {component_name}: File not found")
         continue
 
-    df = pd.read_csv(csv_path)
+    df = loaded_dfs[component_name]
+    comp_dfs[component_name] = df
 
-    # Add component name and category
-    df['Component'] = component_name
-    df['Category'] = info['category']
+    # Collect summary stats - one primary mask per component
+    primary_mask = df['Is_Primary'].eq('Yes') if 'Is_Primary' in df.columns else None
+    has_primary = bool(primary_mask.any()) if primary_mask is not None else False
 
-    all_data.append(df)
-
-    # Collect summary stats
-    summary_stats.append({
-        'Component': component_name,
-        'Category': info['category'],
-        'LOINC_Count': len(df),
-        'Has_Primary': 'Yes' if 'Is_Primary' in df.columns and df['Is_Primary'].eq('Yes').any() else '',
-        'Primary_Code': df[df['Is_Primary'] == 'Yes']['LOINC_Code'].iloc[0] if 'Is_Primary' in df.columns and df['Is_Primary'].eq('Yes').any() else ''
-    })
+    summary_stats['Component'].append(component_name)
+    summary_stats['Category'].append(info['category'])
+    summary_stats['LOINC_Count'].append(len(df))
+    summary_stats['Has_Primary'].append('Yes' if has_primary else '')
+    summary_stats['Primary_Code'].append(df.loc[primary_mask, 'LOINC_Code'].iat[0] if has_primary else '')
 
     print(f"  [OK] {component_name}: {len(df)} LOINC codes")
 
-# Combine all data
-print(f"\nCombining data from {len(all_data)} components...")
-df_combined = pd.concat(all_data, ignore_index=True)
+# Combine all data - Component comes from the concat keys, Category from one map
+print(f"\nCombining data from {len(comp_dfs)} components...")
+df_combined = pd.concat(list(comp_dfs.values()), keys=list(comp_dfs), names=['Component', None])
+df_combined = df_combined.reset_index(level='Component').reset_index(drop=True)
+df_combined['Category'] = df_combined['Component'].map(
+    {name: info['category'] for name, info in cbc_components.items()})
+df_combined = df_combined[[col for col in df_combined.columns if col not in ('Component', 'Category')]
+                          + ['Component', 'Category']]
 
 # Create summary statistics table
 print("Creating summary statistics table...")
 df_summary = pd.DataFrame(summary_stats)
 
-# Reorder columns for better readability
-cols_order = ['Component', 'Category', 'LOINC_Count']
-if 'Has_Primary' in df_summary.columns:
-    cols_order.extend(['Has_Primary', 'Primary_Code'])
-df_summary = df_summary[cols_order]
-
 # Save combined detailed table
 detailed_output = OUTPUT_DIR / 'cbc_combined_detailed.csv'
-df_combined.to_csv(detailed_output, index=False)
+write_table(df_combined, detailed_output)
 print(f"\n  Saved detailed table: {detailed_output}")
 print(f"    Total rows: {len(df_combined)}")
 
 # Save summary table
 summary_output = OUTPUT_DIR / 'cbc_summary.csv'
-df_summary.to_csv(summary_output, index=False)
+write_table(df_summary, summary_output)
 print(f"  Saved summary table: {summary_output}")
 print(f"    Total components: {len(df_summary)}")
 
 # Create a pivot-style table showing LOINC codes by component
 print("\nCreating component-LOINC matrix...")
-# Select key columns
-matrix_data = []
-for component_name, info in cbc_components.items():
-    csv_path = OUTPUT_DIR / info['dir'] / info['csv']
-    if not csv_path.exists():
-        continue
-
-    df = pd.read_csv(csv_path)
-    for _, row in df.iterrows():
-        matrix_data.append({
-            'Component': component_name,
-            'LOINC_Code': row['LOINC_Code'],
-            'LOINC_Display': row.get('LOINC_Display', ''),
-            'Category': info['category']
-        })
+# Select key columns from the already loaded component tables
+matrix_parts = [
+    pd.DataFrame({
+        'Component': component_name,
+        'LOINC_Code': df['LOINC_Code'],
+        'LOINC_Display': df['LOINC_Display'] if 'LOINC_Display' in df.columns else '',
+        'Category': cbc_components[component_name]['category']
+    })
+    for component_name, df in comp_dfs.items()
+]
 
-df_matrix = pd.DataFrame(matrix_data)
+df_matrix = pd.concat(matrix_parts, ignore_index=True) if matrix_parts else pd.DataFrame(
+    columns=['Component', 'LOINC_Code', 'LOINC_Display', 'Category'])
 matrix_output = OUTPUT_DIR / 'cbc_component_loinc_matrix.csv'
-df_matrix.to_csv(matrix_output, index=False)
+write_table(df_matrix, matrix_output)
 print(f"  Saved matrix table: {matrix_output}")
 print(f"    Total LOINC-Component pairs: {len(df_matrix)}")
 
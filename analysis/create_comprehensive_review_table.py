@@ -10,10 +10,11 @@ Generates detailed comparison tables for reviewing all LOINC codes across differ
 Output:
 - detailed_loinc_comparison.csv: Row per LOINC code with all approach columns
 - approach_summary.csv: Overall performance metrics per approach
+(each also written as .parquet for faster loading in later Python steps)
 """
 
+import numpy as np
 import pandas as pd
-import json
 import os
 import sys
 import asyncio
@@ -23,7 +24,10 @@ from collections import defaultdict
 # Add scripts to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
+from excel_loader import read_excel_cached
+from json_io import load_json
+from table_io import write_table
 
 # Configuration
 INPUT_EXCEL = PROJECT_ROOT / 'input' / 'LOINC_Mapping_Interpolar_v3.6 an Debersthäuser 25.09.2025.xlsx'
@@ -38,17 +42,16 @@ print("=" * 80)
 # STEP 1: Load Interpolar data
 # ==============================================================================
 print("\n[STEP 1/4] Loading Interpolar data...")
-df = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+df = read_excel_cached(
+    INPUT_EXCEL,
+    sheet_name='LOINC Mapping Interpolar',
+    header=18,
+    usecols=['LOINC', 'LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY']
+)
 
-# Create mapping: LOINC code -> comparability level
-loinc_comparability = {}
-for _, row in df.iterrows():
-    loinc = row['LOINC']
-    primary = row['LOINC_PRIMARY']
-    comparability = row['COMPARABILITY_TO_LOINC_PRIMARY']
-
-    if pd.notna(loinc) and pd.notna(primary) and pd.notna(comparability):
-        loinc_comparability[loinc] = comparability
+# Create mapping: LOINC code -> comparability level (rows with all three values set)
+df_mapped = df[['LOINC', 'LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY']].dropna()
+loinc_comparability = dict(zip(df_mapped['LOINC'].to_numpy(), df_mapped['COMPARABILITY_TO_LOINC_PRIMARY'].to_numpy()))
 
 print(f"  [OK] Loaded comparability for {len(loinc_comparability)} LOINC codes")
 
@@ -69,8 +72,7 @@ experiments = {
 experiment_results = {}
 for name, path in experiments.items():
     if path.exists():
-        with open(path, 'r', encoding='utf-8') as f:
-            experiment_results[name] = json.load(f)
+        experiment_results[name] = load_json(path)
         print(f"  [OK] Loaded {name}: {len(experiment_results[name])} primary codes")
     else:
         print(f"  [SKIP] {name}: file not found")
@@ -84,50 +86,49 @@ print("\n[STEP 3/4] Building LOINC-level comparison table...")
 # Collect all unique LOINC codes across all experiments
 all_loinc_codes = set(loinc_comparability.keys())
 
+# Union of Interpolar / ECL codes over all primaries, per experiment
+exp_interp = {
+    name: set().union(*(pr.get('interpolar_codes', []) for pr in results))
+    for name, results in experiment_results.items()
+}
+exp_ecl = {
+    name: set().union(*(pr.get('ecl_codes', []) for pr in results))
+    for name, results in experiment_results.items()
+}
+
 # Add LOINC codes from ECL experiments
-for exp_name, results in experiment_results.items():
-    for primary_result in results:
-        all_loinc_codes.update(primary_result.get('interpolar_codes', []))
-        all_loinc_codes.update(primary_result.get('ecl_codes', []))
+for exp_name in experiment_results:
+    all_loinc_codes.update(exp_interp[exp_name])
+    all_loinc_codes.update(exp_ecl[exp_name])
 
 print(f"  Found {len(all_loinc_codes)} unique LOINC codes total")
 
 # Fetch LOINC display names
 print(f"  Fetching display names for all LOINC codes...")
-loinc_displays = asyncio.run(fetch_displays_async(sorted(all_loinc_codes), verbose=False))
-
-# Build table rows
-rows = []
-for loinc_code in sorted(all_loinc_codes):
-    row = {
-        'LOINC_Code': loinc_code,
-        'LOINC_Display': loinc_displays.get(loinc_code, ''),
-        'Interpolar_Comparability': loinc_comparability.get(loinc_code, ''),
-    }
-
-    # Add columns for each ECL approach
-    for exp_name in experiments.keys():
-        # Check if this LOINC is in Interpolar for this experiment
-        in_interpolar = False
-        in_ecl = False
-
-        for primary_result in experiment_results.get(exp_name, []):
-            if loinc_code in primary_result.get('interpolar_codes', []):
-                in_interpolar = True
-            if loinc_code in primary_result.get('ecl_codes', []):
-                in_ecl = True
+loinc_displays = asyncio.run(fetch_displays_cached_async(list(all_loinc_codes), verbose=False))
+
+# Build table column-wise: one vectorized isin() per flag column
+codes = pd.Index(sorted(all_loinc_codes))
+columns = {
+    'LOINC_Code': codes,
+    'LOINC_Display': [loinc_displays.get(code, '') for code in codes],
+    'Interpolar_Comparability': [loinc_comparability.get(code, '') for code in codes],
+}
 
-        row[f'{exp_name}_Interpolar'] = 'Yes' if in_interpolar else ''
-        row[f'{exp_name}_ECL'] = 'Yes' if in_ecl else ''
-        row[f'{exp_name}_Match'] = 'Yes' if (in_interpolar and in_ecl) else ''
+# Add columns for each ECL approach
+for exp_name in experiments.keys():
+    in_interpolar = codes.isin(exp_interp[exp_name])
+    in_ecl = codes.isin(exp_ecl[exp_name])
 
-    rows.append(row)
+    columns[f'{exp_name}_Interpolar'] = np.where(in_interpolar, 'Yes', '')
+    columns[f'{exp_name}_ECL'] = np.where(in_ecl, 'Yes', '')
+    columns[f'{exp_name}_Match'] = np.where(in_interpolar & in_ecl, 'Yes', '')
 
-df_detailed = pd.DataFrame(rows)
+df_detailed = pd.DataFrame(columns)
 
 # Save detailed table
 output_file = OUTPUT_DIR / 'detailed_loinc_comparison.csv'
-df_detailed.to_csv(output_file, index=False)
+write_table(df_detailed, output_file)
 print(f"  [OK] Saved detailed table: {output_file}")
 print(f"       Rows: {len(df_detailed)}, Columns: {len(df_detailed.columns)}")
 
@@ -142,15 +143,16 @@ for exp_name, results in experiment_results.items():
     if not results:
         continue
 
-    # Calculate metrics
-    total_primary = len(results)
-    total_interpolar = sum(r['interpolar_count'] for r in results)
-    total_ecl = sum(r['ecl_count'] for r in results)
-    total_overlap = sum(r['overlap_count'] for r in results)
+    # Calculate metrics with column reductions over all primary results
+    rdf = pd.DataFrame(results)
+    total_primary = len(rdf)
+    total_interpolar = int(rdf['interpolar_count'].sum())
+    total_ecl = int(rdf['ecl_count'].sum())
+    total_overlap = int(rdf['overlap_count'].sum())
 
-    avg_precision = sum(r['precision'] for r in results) / total_primary if total_primary else 0
-    avg_recall = sum(r['recall'] for r in results) / total_primary if total_primary else 0
-    avg_f1 = sum(r['f1_score'] for r in results) / total_primary if total_primary else 0
+    avg_precision = float(rdf['precision'].mean())
+    avg_recall = float(rdf['recall'].mean())
+    avg_f1 = float(rdf['f1_score'].mean())
 
     # Coverage rate (what % of Interpolar codes are found by ECL)
     coverage_rate = (total_overlap / total_interpolar * 100) if total_interpolar else 0
@@ -171,7 +173,7 @@ df_summary = pd.DataFrame(summary_rows)
 
 # Save summary table
 summary_file = OUTPUT_DIR / 'approach_summary.csv'
-df_summary.to_csv(summary_file, index=False)
+write_table(df_summary, summary_file)
 print(f"  [OK] Saved summary table: {summary_file}")
 
 # Print summary to console
@@ -14,16 +14,27 @@ For each LOINC parameter, shows:
 6. SNOMED attributes (Component, Property, Direct site)
 
 Usage:
-    python create_decision_dashboard.py <primary_loinc> <output_name>
+    python create_decision_dashboard.py <primary_loinc> <output_name> [custom_queries.json] [--binary]
+    python create_decision_dashboard.py --batch <primaries.csv> [--jobs N] [--binary]
 
 Example:
     python create_decision_dashboard.py 14682-9 creatinine
+
+Batch mode:
+    The CSV needs the columns primary_loinc, output_name and optionally
+    custom_queries. Dashboards are built in parallel threads that share the
+    mappings, RF2 indexes, Interpolar sheet and terminology server adapter.
 """
 
 import sys
 import os
-import json
+import re
+import csv
 import asyncio
+import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -37,7 +48,10 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'scripts'))
 from ecl_permutation_analyzer_simple import load_loinc_mappings, execute_ecl_query
 from terminology_server_adapters import create_adapter
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
+from snomed_rf2_index import load_relationship_index, load_attribute_index, load_fsn_index
+from excel_loader import read_excel_cached
+from json_io import load_json
 
 # Configuration
 LOINC_SNOMED_MAPPING_PATH = os.getenv('loinc_snomed_mapping_path')
@@ -60,96 +74,124 @@ DIRECT_SITE_ATTRIBUTE_ID = "704327008"
 MEASUREMENT_PROPERTY_SCTID = "685451010000100"
 MEASUREMENT_PROPERTY_LABEL = "Measurement property (qualifier value)"
 
+# Concept IDs in ECL expressions (digits only, typically 6-18 digits for SNOMED)
+# and the subset already labeled with |...| after them
+_CONCEPT_RE = re.compile(r'\b(\d{6,18})\b')
+_LABELED_RE = re.compile(r'\b(\d{6,18})\s*\|')
+
+# Row template for the LOINC comparison matrix, parsed once and filled per row
+MATRIX_ROW_TMPL = """
+                <tr class="{row_class}">
+                    <td>{loinc}</td>
+                    <td>{display}</td>
+                    <td>{in_interpolar}</td>
+                    <td>{in_mii300}</td>
+{exp_cells}                </tr>
+"""
+MATRIX_ROW_FIELDS = ('loinc', 'display', 'row_class', 'in_interpolar', 'in_mii300', 'exp_cells')
+
+class _FSNLookupFailed(Exception):
+    """Raised by _cached_fsn so that failed lookups are not memoized."""
+
+    def __init__(self, placeholder):
+        super().__init__(placeholder)
+        self.placeholder = placeholder
+
+@functools.lru_cache(maxsize=4096)
+def _cached_fsn(adapter, concept_id):
+    """Fetch an FSN; raises _FSNLookupFailed for the adapters' failure placeholders."""
+    fsn = adapter.get_concept_details(concept_id).get('fsn', '')
+    if not fsn or fsn == 'Unknown':
+        raise _FSNLookupFailed(fsn)
+    return fsn
+
+def _fsn(adapter, concept_id):
+    """
+    Get the FSN of a concept from the terminology server, memoized per run.
+
+    The primary concept and its attributes are needed for several ECL
+    expressions and again in the dashboard header; each is fetched once.
+    Failed lookups are not memoized, so a later dashboard retries them.
+    """
+    try:
+        return _cached_fsn(adapter, concept_id)
+    except _FSNLookupFailed as e:
+        return e.placeholder
+
 def get_snomed_fsn(concept_id, description_file):
-    """Get Fully Specified Name for a SNOMED concept."""
+    """
+    Get Fully Specified Name for a SNOMED concept.
+
+    The description file is parsed once per process into a concept ID -> FSN
+    index, so repeated lookups do not rescan the file.
+    """
     if not concept_id:
         return "N/A"
 
-    with open(description_file, 'r', encoding='utf-8') as f:
-        header = next(f).strip().split('\t')
-        # Find column indices
-        concept_idx = header.index('conceptId')
-        active_idx = header.index('active')
-        type_idx = header.index('typeId')
-        term_idx = header.index('term')
-
-        for line in f:
-            parts = line.strip().split('\t')
-            if len(parts) > max(concept_idx, active_idx, type_idx, term_idx):
-                active = parts[active_idx]
-                concept = parts[concept_idx]
-                type_id = parts[type_idx]
-                term = parts[term_idx]
-
-                if active == '1' and concept == concept_id and type_id == '900000000000003001':  # FSN
-                    return term
-    return f"[{concept_id}] (FSN not found)"
+    fsn = load_fsn_index(description_file).get(concept_id)
+    if fsn is None:
+        return f"[{concept_id}] (FSN not found)"
+    return fsn
 
 def load_snomed_attributes(relationship_file, concept_id):
-    """Extract Component, Property, and Direct site attributes."""
-    attributes = {}
-
-    with open(relationship_file, 'r', encoding='utf-8') as f:
-        next(f)  # Skip header
-        for line in f:
-            parts = line.strip().split('\t')
-            if len(parts) >= 5:
-                active = parts[2]
-                source_id = parts[4]
-                type_id = parts[7]
-                destination_id = parts[5]
-
-                if active == '1' and source_id == concept_id:
-                    if type_id == COMPONENT_ATTRIBUTE_ID:
-                        attributes['component'] = destination_id
-                    elif type_id == PROPERTY_ATTRIBUTE_ID:
-                        attributes['property'] = destination_id
-                    elif type_id == DIRECT_SITE_ATTRIBUTE_ID:
-                        attributes['direct_site'] = destination_id
-
-    return attributes
+    """
+    Extract Component, Property, and Direct site attributes.
+
+    Looks the concept up in the cached attribute index, which is built once
+    per process from the relationship index.
+    """
+    return dict(load_attribute_index(relationship_file).get(concept_id, {}))
 
 def extract_specimen_types(loinc_mappings, snomed_concepts, adapter):
-    """Extract specimen types from SNOMED concepts using terminology server."""
+    """
+    Extract specimen types from SNOMED concepts using terminology server.
+
+    Direct site relationships of all concepts are selected from the cached
+    relationship index in one filter instead of rescanning the relationship
+    file per concept.
+    """
     specimens = {}
 
-    for concept_id in snomed_concepts:
-        if concept_id in loinc_mappings:
-            # Look for Direct site relationships
-            with open(RELATIONSHIP_FILE, 'r', encoding='utf-8') as f:
-                next(f)
-                for line in f:
-                    parts = line.strip().split('\t')
-                    if len(parts) >= 8:
-                        active = parts[2]
-                        source_id = parts[4]
-                        type_id = parts[7]
-                        destination_id = parts[5]
-
-                        if active == '1' and source_id == concept_id and type_id == DIRECT_SITE_ATTRIBUTE_ID:
-                            # Use terminology server to get FSN (faster and has all concepts)
-                            if destination_id not in specimens:
-                                details = adapter.get_concept_details(destination_id)
-                                specimens[destination_id] = details.get('fsn', f'[{destination_id}] (not found)')
+    mapped_concepts = [concept_id for concept_id in snomed_concepts if concept_id in loinc_mappings]
+    if not mapped_concepts:
+        # e.g. all experiments loaded from cache - nothing to look up
+        return specimens
+
+    df_relationships = load_relationship_index(RELATIONSHIP_FILE)
+    mask = (
+        (df_relationships['typeId'] == DIRECT_SITE_ATTRIBUTE_ID)
+        & df_relationships['sourceId'].isin(mapped_concepts)
+    )
+
+    # Use terminology server to get FSNs (faster and has all concepts) - one bulk lookup
+    specimen_ids = df_relationships.loc[mask, 'destinationId'].unique().tolist()
+    for destination_id, details in adapter.get_concepts_details(specimen_ids).items():
+        specimens[destination_id] = details.get('fsn', f'[{destination_id}] (not found)')
 
     return specimens
 
-def load_cached_experiment_result(cached_json_path, primary_loinc, ecl_expression):
-    """Load experiment results from cached JSON file."""
+def load_cached_experiment_result(cached_json_path, primary_loinc, ecl_expression=None):
+    """
+    Load experiment results from cached JSON file.
+
+    ecl_expression may be left out when the file is read before the query is
+    built; run_ecl_experiment() fills it in when it uses the cached result.
+    """
     if not cached_json_path.exists():
         return None
 
-    with open(cached_json_path, 'r', encoding='utf-8') as f:
-        cached_data = json.load(f)
+    cached_data = load_json(cached_json_path)
 
     if primary_loinc not in cached_data:
         return None
 
     entry = cached_data[primary_loinc]
+    loinc_codes = entry.get('loinc_codes_found', [])
     return {
         'ecl_expression': ecl_expression,
-        'loinc_codes': entry.get('loinc_codes_found', []),
-        'snomed_concepts': [],  # Will populate from loinc_mappings if needed
+        'loinc_codes': loinc_codes,
+        'loinc_codes_set': frozenset(loinc_codes),
+        'snomed_concepts': frozenset(),  # Will populate from loinc_mappings if needed
         'snomed_concept_count': entry.get('snomed_concept_count', 0),
         'execution_time': entry.get('execution_time', 0)
     }
@@ -158,80 +200,99 @@ def run_ecl_experiment(ecl_name, ecl_expression, loinc_mappings, adapter, cached
     """Execute a single ECL query experiment (or use cached result)."""
     if cached_result:
         print(f"    Loading cached: {ecl_name}")
-        return cached_result
+        return {**cached_result, 'ecl_expression': ecl_expression}
 
     print(f"    Running: {ecl_name}")
     result = execute_ecl_query(ecl_expression, loinc_mappings, limit=1000, server_adapter=adapter)
 
-    loinc_codes = []
-    snomed_concepts = []
-
-    for concept in result.get('detailed_concepts', []):
-        if concept.get('loinc_code'):
-            loinc_codes.append(concept['loinc_code'])
-        if concept.get('concept_id'):
-            snomed_concepts.append(concept['concept_id'])
+    detailed_concepts = result.get('detailed_concepts', [])
+    loinc_codes_set = frozenset(concept['loinc_code'] for concept in detailed_concepts if concept.get('loinc_code'))
 
     return {
         'ecl_expression': ecl_expression,
-        'loinc_codes': sorted(list(set(loinc_codes))),
-        'snomed_concepts': sorted(list(set(snomed_concepts))),
+        'loinc_codes': sorted(loinc_codes_set),
+        'loinc_codes_set': loinc_codes_set,
+        # Only used as a set for specimen extraction - no sorted list needed
+        'snomed_concepts': frozenset(concept['concept_id'] for concept in detailed_concepts if concept.get('concept_id')),
         'snomed_concept_count': result.get('total', 0),
         'execution_time': result.get('execution_time', 0),
         'description': description
     }
 
-def generate_html_dashboard(primary_loinc, component_name, snomed_concept_id, attributes, experiments, interpolar_codes, loinc_displays, specimens, adapter, mii300_codes, binary_output=False):
-    """Generate HTML dashboard for decision-making."""
-
-    # Collect all LOINC codes
-    all_loinc_codes = set(interpolar_codes)
-    for exp in experiments.values():
-        all_loinc_codes.update(exp['loinc_codes'])
-
-    # Build comparison matrix
-    comparison_rows = []
-    for loinc_code in all_loinc_codes:
-        row = {
-            'loinc': loinc_code,
-            'display': loinc_displays.get(loinc_code, f'LOINC {loinc_code}'),
-            'is_primary': loinc_code == primary_loinc,
-            'in_interpolar': loinc_code in interpolar_codes,
-            'in_mii300': loinc_code in mii300_codes,
-            'hit_count': 0
-        }
+def generate_html_dashboard(write, primary_loinc, component_name, snomed_concept_id, attributes, experiments, interpolar_codes, loinc_displays, specimens, adapter, mii300_codes, binary_output=False):
+    """
+    Generate HTML dashboard for decision-making.
 
-        for exp_name, exp_data in experiments.items():
-            is_in_exp = loinc_code in exp_data['loinc_codes']
-            row[exp_name] = is_in_exp
-            if is_in_exp:
-                row['hit_count'] += 1
+    Each section is passed to write() as soon as it is built (e.g. the
+    write method of the open output file), so the page is never held in
+    memory as one string.
+    """
 
-        comparison_rows.append(row)
-
-    # Sort by hit count (descending), then by LOINC code
-    comparison_rows.sort(key=lambda x: (-x['hit_count'], x['loinc']))
+    # Collect all LOINC codes
+    all_loinc_codes = interpolar_codes.union(*(exp['loinc_codes_set'] for exp in experiments.values()))
+
+    # Build comparison matrix over one shared, sorted code index - membership of
+    # each experiment is a boolean column (one byte per code) instead of a set
+    codes = pd.Index(sorted(all_loinc_codes))
+    in_interpolar = codes.isin(interpolar_codes)
+    exp_hits = np.zeros((len(codes), len(experiments)), dtype=bool)
+    for i, exp_data in enumerate(experiments.values()):
+        exp_hits[:, i] = codes.isin(exp_data['loinc_codes_set'])
+
+    df_matrix = pd.DataFrame({
+        'loinc': codes,
+        'display': [loinc_displays.get(code, f'LOINC {code}') for code in codes],
+        'is_primary': codes == primary_loinc,
+        'in_interpolar': in_interpolar,
+        'in_mii300': codes.isin(mii300_codes)
+    })
+    for i, exp_name in enumerate(experiments):
+        df_matrix[exp_name] = exp_hits[:, i]
+    df_matrix['hit_count'] = exp_hits.sum(axis=1, dtype='int32')
+
+    # Sort by hit count (descending), then by LOINC code - rows are already in
+    # LOINC order, so a stable sort on the integer count alone keeps the tie order
+    df_matrix = df_matrix.sort_values('hit_count', ascending=False, kind='stable', ignore_index=True)
+
+    # Calculate statistics from the membership columns
+    exp_counts = exp_hits.sum(axis=0)
+    overlap_counts = (exp_hits & in_interpolar[:, None]).sum(axis=0)
 
-    # Calculate statistics
     stats = {}
-    for exp_name, exp_data in experiments.items():
-        exp_codes = set(exp_data['loinc_codes'])
-        overlap = exp_codes & interpolar_codes
-
-        precision = len(overlap) / len(exp_codes) if exp_codes else 0
-        recall = len(overlap) / len(interpolar_codes) if interpolar_codes else 0
+    for exp_name, n_codes, n_overlap in zip(experiments, exp_counts.tolist(), overlap_counts.tolist()):
+        precision = n_overlap / n_codes if n_codes else 0
+        recall = n_overlap / len(interpolar_codes) if interpolar_codes else 0
         f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
 
         stats[exp_name] = {
-            'codes': len(exp_codes),
-            'overlap': len(overlap),
+            'codes': n_codes,
+            'overlap': n_overlap,
             'precision': precision,
             'recall': recall,
             'f1': f1
         }
 
+    # Look up the FSNs of all unlabeled concept IDs in the ECL queries in one
+    # bulk request (primary concept and attributes are already memoized)
+    unlabeled_ecl_ids = {}
+    for exp_name, exp_data in experiments.items():
+        ecl_expression = exp_data['ecl_expression']
+        # Concept IDs that are not already labeled (no |...| after them)
+        unlabeled_ecl_ids[exp_name] = (
+            set(_CONCEPT_RE.findall(ecl_expression)) - set(_LABELED_RE.findall(ecl_expression))
+        )
+
+    lookup_ids = set()
+    for concept_ids in unlabeled_ecl_ids.values():
+        lookup_ids.update(concept_ids)
+    concept_details = adapter.get_concepts_details(sorted(lookup_ids))
+
+    def attribute_fsn(key):
+        concept_id = attributes.get(key)
+        return _fsn(adapter, concept_id) if concept_id else 'N/A'
+
     # Generate HTML
-    html = f"""<!DOCTYPE html>
+    write(f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -352,24 +413,24 @@ def generate_html_dashboard(primary_loinc, component_name, snomed_concept_id, at
     <div class="section">
         <h2>SNOMED Concept & Attributes</h2>
         <div class="attributes">
-            <p><strong>Primary Observable Entity:</strong> {snomed_concept_id} - {adapter.get_concept_details(snomed_concept_id).get('fsn', 'N/A')}</p>
+            <p><strong>Primary Observable Entity:</strong> {snomed_concept_id} - {_fsn(adapter, snomed_concept_id)}</p>
             <hr>
-            <p><strong>Component:</strong> {attributes.get('component', 'N/A')} - {adapter.get_concept_details(attributes['component']).get('fsn', 'N/A') if attributes.get('component') else 'N/A'}</p>
-            <p><strong>Property:</strong> {attributes.get('property', 'N/A')} - {adapter.get_concept_details(attributes['property']).get('fsn', 'N/A') if attributes.get('property') else 'N/A'}</p>
-            <p><strong>Direct site:</strong> {attributes.get('direct_site', 'N/A')} - {adapter.get_concept_details(attributes['direct_site']).get('fsn', 'N/A') if attributes.get('direct_site') else 'N/A'}</p>
+            <p><strong>Component:</strong> {attributes.get('component', 'N/A')} - {attribute_fsn('component')}</p>
+            <p><strong>Property:</strong> {attributes.get('property', 'N/A')} - {attribute_fsn('property')}</p>
+            <p><strong>Direct site:</strong> {attributes.get('direct_site', 'N/A')} - {attribute_fsn('direct_site')}</p>
         </div>
     </div>
 
     <div class="section">
         <h2>ECL Experiment Statistics</h2>
         <div class="stat-grid">
-"""
+""")
 
     for exp_name, stat in stats.items():
         recall_class = 'good' if stat['recall'] >= 0.9 else 'medium' if stat['recall'] >= 0.7 else 'poor'
         precision_class = 'good' if stat['precision'] >= 0.9 else 'medium' if stat['precision'] >= 0.7 else 'poor'
 
-        html += f"""
+        write(f"""
             <div class="stat-card">
                 <h4>{exp_name.replace('_', ' ').title()}</h4>
                 <p>Codes: <span class="stat-value">{stat['codes']}</span></p>
@@ -377,59 +438,52 @@ def generate_html_dashboard(primary_loinc, component_name, snomed_concept_id, at
                 <p>Precision: <span class="{precision_class}">{stat['precision']:.1%}</span></p>
                 <p>F1: {stat['f1']:.3f}</p>
             </div>
-"""
+""")
 
-    html += """
+    write("""
         </div>
     </div>
 
     <div class="section">
         <h2>Specimen Types Found</h2>
         <ul class="specimen-list">
-"""
+""")
 
     for sctid, fsn in sorted(specimens.items(), key=lambda x: x[1]):
-        html += f"            <li><strong>{sctid}</strong> - {fsn}</li>\n"
+        write(f"            <li><strong>{sctid}</strong> - {fsn}</li>\n")
 
-    html += """
+    write("""
         </ul>
         <p><em>Consider excluding specimen types that are not relevant for this analysis (e.g., cord blood, plasma, urine).</em></p>
     </div>
 
     <div class="section">
         <h2>ECL Query Details</h2>
-"""
+""")
 
     for exp_name, exp_data in experiments.items():
         # Add FSN labels to the ECL expression for display
         ecl_display = exp_data['ecl_expression']
 
-        # Find all concept IDs (digits only, typically 6-18 digits for SNOMED)
-        import re
-        concept_ids = re.findall(r'\b(\d{6,18})\b', ecl_display)
-
-        # Replace each concept ID with ID |FSN| format if not already labeled
-        for concept_id in set(concept_ids):
-            # Check if this concept ID is already labeled (has |...| after it)
-            if not re.search(rf'{concept_id}\s*\|', ecl_display):
-                # Get FSN and add label
-                fsn = adapter.get_concept_details(concept_id).get('fsn', '')
-                if fsn:
-                    ecl_display = ecl_display.replace(concept_id, f"{concept_id} |{fsn}|")
+        # Replace each unlabeled concept ID with ID |FSN| format
+        for concept_id in unlabeled_ecl_ids[exp_name]:
+            fsn = concept_details[concept_id].get('fsn', '')
+            if fsn:
+                ecl_display = ecl_display.replace(concept_id, f"{concept_id} |{fsn}|")
 
         # Add description if available
         description_html = ""
         if exp_data.get('description'):
             description_html = f"<p><em>{exp_data['description']}</em></p>"
 
-        html += f"""
+        write(f"""
         <h3>{exp_name.replace('_', ' ').title()}</h3>
         {description_html}
         <div class="ecl-query">{ecl_display}</div>
         <p>Results: {exp_data['snomed_concept_count']} SNOMED concepts, {len(exp_data['loinc_codes'])} LOINC codes</p>
-"""
+""")
 
-    html += """
+    write("""
     </div>
 
     <div class="section">
@@ -442,39 +496,44 @@ def generate_html_dashboard(primary_loinc, component_name, snomed_concept_id, at
                     <th>Display Name</th>
                     <th>Interpolar</th>
                     <th>MII300</th>
-"""
+""")
 
     for exp_name in experiments.keys():
         # Don't truncate column names - use title case and full name
         display_name = exp_name.replace('_', ' ').title()
-        html += f"                    <th>{display_name}</th>\n"
+        write(f"                    <th>{display_name}</th>\n")
 
-    html += """
+    write("""
                 </tr>
             </thead>
             <tbody>
-"""
+""")
 
     # Define check mark display based on binary_output flag
     check_true = '1' if binary_output else '✓'
     check_false = '0' if binary_output else ''
 
-    for row in comparison_rows:
-        row_class = 'primary' if row['is_primary'] else 'interpolar' if row['in_interpolar'] else ''
-        html += f"""
-                <tr class="{row_class}">
-                    <td>{row['loinc']}</td>
-                    <td>{row['display']}</td>
-                    <td>{check_true if row['in_interpolar'] else check_false}</td>
-                    <td>{check_true if row['in_mii300'] else check_false}</td>
-"""
-
-        for exp_name in experiments.keys():
-            html += f"                    <td class=\"check\">{check_true if row[exp_name] else check_false}</td>\n"
-
-        html += "                </tr>\n"
-
-    html += """
+    # Precompute cell contents column-wise instead of branching per row and experiment
+    is_primary = df_matrix['is_primary'].to_numpy()
+    in_interpolar = df_matrix['in_interpolar'].to_numpy()
+    row_classes = np.where(is_primary, 'primary', np.where(in_interpolar, 'interpolar', ''))
+    interpolar_cells = np.where(in_interpolar, check_true, check_false)
+    mii300_cells = np.where(df_matrix['in_mii300'].to_numpy(), check_true, check_false)
+
+    exp_true_td = f'                    <td class="check">{check_true}</td>\n'
+    exp_false_td = f'                    <td class="check">{check_false}</td>\n'
+    exp_cells = np.full(len(df_matrix), '', dtype=object)
+    for exp_name in experiments:
+        exp_cells = exp_cells + np.where(df_matrix[exp_name].to_numpy(), exp_true_td, exp_false_td).astype(object)
+
+    format_row = MATRIX_ROW_TMPL.format_map
+    write(''.join(
+        format_row(dict(zip(MATRIX_ROW_FIELDS, values)))
+        for values in zip(df_matrix['loinc'], df_matrix['display'], row_classes,
+                          interpolar_cells, mii300_cells, exp_cells)
+    ))
+
+    write("""
             </tbody>
         </table>
     </div>
@@ -504,31 +563,66 @@ def generate_html_dashboard(primary_loinc, component_name, snomed_concept_id, at
     </div>
 </body>
 </html>
-"""
+""")
 
-    return html
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python create_decision_dashboard.py <primary_loinc> <output_name> [custom_queries.json] [--binary]")
-        print("Example: python create_decision_dashboard.py 14682-9 creatinine")
-        print("Example with custom queries: python create_decision_dashboard.py 14682-9 creatinine custom_ecl.json")
-        print("Example with binary output: python create_decision_dashboard.py 14682-9 creatinine custom_ecl.json --binary")
-        sys.exit(1)
+@functools.lru_cache(maxsize=1)
+def _reverse_index(mapping_path):
+    """
+    Load LOINC-SNOMED mappings together with a LOINC -> SNOMED reverse index.
 
-    primary_loinc = sys.argv[1]
-    component_name = sys.argv[2]
+    Cached so that all dashboards in one process (e.g. batch runs) share the
+    mappings and the reverse index is built only once.
 
-    # Parse optional arguments
-    custom_queries_file = None
-    binary_output = False
-
-    for arg in sys.argv[3:]:
-        if arg == '--binary':
-            binary_output = True
-        elif not arg.startswith('--'):
-            custom_queries_file = arg
+    Returns:
+        tuple (loinc_mappings, loinc_to_snomed)
+    """
+    loinc_mappings = load_loinc_mappings(mapping_path)
+    loinc_to_snomed = {data['loinc_code']: sctid for sctid, data in loinc_mappings.items() if data.get('loinc_code')}
+    return loinc_mappings, loinc_to_snomed
+
+@functools.lru_cache(maxsize=1)
+def _interpolar_sheet():
+    """Interpolar reference columns, loaded once per process and shared by all dashboards."""
+    return read_excel_cached(
+        INPUT_EXCEL,
+        sheet_name='LOINC Mapping Interpolar',
+        header=18,
+        usecols=['LOINC', 'LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY']
+    )
 
+@functools.lru_cache(maxsize=8)
+def _load_mii300(valueset_path, mtime):
+    """
+    Load the MII Top 300 LOINC codes from the valueset JSON.
+
+    Keyed on the file's mtime, so dashboards in one process parse the valueset
+    once and a regenerated valueset is picked up.
+
+    Returns:
+        frozenset of LOINC codes
+    """
+    mii300_vs = load_json(valueset_path)
+    return frozenset(c['code'] for c in mii300_vs['compose']['include'][0]['concept'])
+
+@functools.lru_cache(maxsize=4)
+def _get_adapter(server_type):
+    """Terminology server adapter, created once per process and shared by all dashboards."""
+    return create_adapter(server_type)
+
+def create_dashboard(primary_loinc, component_name, custom_queries_file=None, binary_output=False):
+    """
+    Run the ECL experiments for one primary LOINC and write its dashboard.
+
+    Args:
+        primary_loinc: Primary LOINC code
+        component_name: Output name (dashboard file prefix)
+        custom_queries_file: Optional JSON file with additional ECL queries
+        binary_output: Use 1/0 instead of checkmarks in the comparison matrix
+
+    Returns:
+        Path of the written HTML file
+    """
     print("=" * 80)
     print(f"ECL DECISION DASHBOARD: {component_name.upper()}")
     print("=" * 80)
@@ -536,11 +630,10 @@ def main():
 
     # Load LOINC-SNOMED mappings
     print("[1/6] Loading LOINC-SNOMED mappings...")
-    loinc_mappings = load_loinc_mappings(LOINC_SNOMED_MAPPING_PATH)
+    loinc_mappings, loinc_to_snomed = _reverse_index(LOINC_SNOMED_MAPPING_PATH)
     print(f"  [OK] Loaded {len(loinc_mappings)} mappings")
 
     # Get SNOMED concept ID
-    loinc_to_snomed = {data['loinc_code']: sctid for sctid, data in loinc_mappings.items() if data.get('loinc_code')}
     if primary_loinc not in loinc_to_snomed:
         print(f"ERROR: Primary LOINC {primary_loinc} not found in SNOMED mappings")
         sys.exit(1)
@@ -557,33 +650,31 @@ def main():
 
     # Load Interpolar reference
     print("\n[3/6] Loading Interpolar reference...")
-    df_interpolar = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+    df_interpolar = _interpolar_sheet()
 
     # Include both level 1 (quantitative) and level 2 (cutoff-based) comparability
-    # Get all secondary codes where this is the primary
-    df_comparable = df_interpolar[
-        df_interpolar['COMPARABILITY_TO_LOINC_PRIMARY'].isin(['1 - quantitativ', '2 - cutoff_Fragestellung'])
-    ].copy()
-    interpolar_secondary_codes = set(df_comparable[df_comparable['LOINC_PRIMARY'] == primary_loinc]['LOINC'].dropna().unique())
+    comparable_mask = df_interpolar['COMPARABILITY_TO_LOINC_PRIMARY'].isin(['1 - quantitativ', '2 - cutoff_Fragestellung'])
+
+    # Get all secondary codes where this is the primary - one combined mask, no intermediate copy
+    secondary_mask = comparable_mask & (df_interpolar['LOINC_PRIMARY'] == primary_loinc)
+    interpolar_secondary_codes = frozenset(df_interpolar.loc[secondary_mask, 'LOINC'].dropna())
 
     # Check if the primary itself appears as a LOINC code in Interpolar with level 1+2
-    primary_in_interpolar = primary_loinc in df_comparable['LOINC'].values
+    primary_in_interpolar = bool((comparable_mask & (df_interpolar['LOINC'] == primary_loinc)).any())
 
     # Build interpolar_codes set: include secondaries + primary if it's actually in Interpolar
-    interpolar_codes = interpolar_secondary_codes.copy()
+    interpolar_codes = interpolar_secondary_codes
     if primary_in_interpolar:
-        interpolar_codes.add(primary_loinc)
+        interpolar_codes = interpolar_codes | {primary_loinc}
 
     has_interpolar_reference = len(interpolar_codes) > 0
 
     # Load MII Top 300 codes from valueset
     try:
-        with open(MII300_VALUESET, 'r', encoding='utf-8') as f:
-            mii300_vs = json.load(f)
-            mii300_codes = set([c['code'] for c in mii300_vs['compose']['include'][0]['concept']])
+        mii300_codes = _load_mii300(str(MII300_VALUESET), MII300_VALUESET.stat().st_mtime)
     except Exception as e:
         print(f"  WARNING: Could not load MII300 valueset: {e}")
-        mii300_codes = set()
+        mii300_codes = frozenset()
 
     if has_interpolar_reference:
         print(f"  [OK] Found {len(interpolar_codes)} Interpolar codes (level 1+2 comparability)")
@@ -593,7 +684,7 @@ def main():
 
     # Connect to terminology server
     print("\n[4/6] Connecting to terminology server...")
-    adapter = create_adapter('loincsnomed')
+    adapter = _get_adapter('loincsnomed')
     print("  [OK] Connected")
 
     # Run all ECL experiments (using cached results where available)
@@ -610,10 +701,21 @@ def main():
         'ecl_fixed_component_system': cache_dir / 'ecl_fixed_component_system' / 'ecl_query_results_summary.json',
     }
 
+    # Read the cached results and prefetch the FSNs for the ECL labels in parallel -
+    # disk and server I/O overlap instead of running one after another
+    fsn_ids = [snomed_concept_id, *(concept_id for concept_id in attributes.values() if concept_id)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        fsn_prefetch = pool.map(lambda concept_id: _fsn(adapter, concept_id), fsn_ids)
+        cached_results = dict(zip(cache_paths, pool.map(
+            lambda path: load_cached_experiment_result(path, primary_loinc),
+            cache_paths.values()
+        )))
+        list(fsn_prefetch)
+
     # Exp 0: Pre-coordinated hierarchy (ALWAYS run first - descendants of the primary observable entity itself)
-    primary_fsn = adapter.get_concept_details(snomed_concept_id).get('fsn', '')
+    primary_fsn = _fsn(adapter, snomed_concept_id)
     ecl_precoord = f"<< {snomed_concept_id} |{primary_fsn}|"
-    cached_result = load_cached_experiment_result(cache_paths['precoord_descendants'], primary_loinc, ecl_precoord)
+    cached_result = cached_results['precoord_descendants']
     experiments['precoord_descendants'] = run_ecl_experiment(
         'precoord_descendants',
         ecl_precoord,
@@ -624,11 +726,11 @@ def main():
 
     if attributes.get('component'):
         # Get FSN labels for readability
-        comp_fsn = adapter.get_concept_details(attributes['component']).get('fsn', '')
+        comp_fsn = _fsn(adapter, attributes['component'])
 
         # Exp 1: Fixed Component
         ecl_fixed_comp = f"<< 363787002 |Observable entity| : 246093002 |Component| = {attributes['component']} |{comp_fsn}|"
-        cached_result = load_cached_experiment_result(cache_paths['ecl_fixed_component'], primary_loinc, ecl_fixed_comp)
+        cached_result = cached_results['ecl_fixed_component']
         experiments['ecl_fixed_component'] = run_ecl_experiment(
             'ecl_fixed_component',
             ecl_fixed_comp,
@@ -639,7 +741,7 @@ def main():
 
         # Exp 2: Component Descendants
         ecl_comp_desc = f"<< 363787002 |Observable entity| : 246093002 |Component| = << {attributes['component']} |{comp_fsn}|"
-        cached_result = load_cached_experiment_result(cache_paths['ecl_component_descendants'], primary_loinc, ecl_comp_desc)
+        cached_result = cached_results['ecl_component_descendants']
         experiments['ecl_component_descendants'] = run_ecl_experiment(
             'ecl_component_descendants',
             ecl_comp_desc,
@@ -650,12 +752,12 @@ def main():
 
     if attributes.get('component') and attributes.get('property'):
         # Get FSN labels for readability
-        comp_fsn = adapter.get_concept_details(attributes['component']).get('fsn', '')
-        prop_fsn = adapter.get_concept_details(attributes['property']).get('fsn', '')
+        comp_fsn = _fsn(adapter, attributes['component'])
+        prop_fsn = _fsn(adapter, attributes['property'])
 
         # Exp 3: Fixed Component Property
         ecl_comp_prop = f"<< 363787002 |Observable entity| : 246093002 |Component| = {attributes['component']} |{comp_fsn}|, 370130000 |Property| = {attributes['property']} |{prop_fsn}|"
-        cached_result = load_cached_experiment_result(cache_paths['ecl_fixed_component_property'], primary_loinc, ecl_comp_prop)
+        cached_result = cached_results['ecl_fixed_component_property']
         experiments['ecl_fixed_component_property'] = run_ecl_experiment(
             'ecl_fixed_component_property',
             ecl_comp_prop,
@@ -666,12 +768,12 @@ def main():
 
     if attributes.get('component') and attributes.get('direct_site'):
         # Get FSN labels for readability
-        comp_fsn = adapter.get_concept_details(attributes['component']).get('fsn', '')
-        site_fsn = adapter.get_concept_details(attributes['direct_site']).get('fsn', '')
+        comp_fsn = _fsn(adapter, attributes['component'])
+        site_fsn = _fsn(adapter, attributes['direct_site'])
 
         # Exp 4: Fixed Component System
         ecl_comp_sys = f"<< 363787002 |Observable entity| : 246093002 |Component| = {attributes['component']} |{comp_fsn}|, 704327008 |Direct site| = << {attributes['direct_site']} |{site_fsn}|"
-        cached_result = load_cached_experiment_result(cache_paths['ecl_fixed_component_system'], primary_loinc, ecl_comp_sys)
+        cached_result = cached_results['ecl_fixed_component_system']
         experiments['ecl_fixed_component_system'] = run_ecl_experiment(
             'ecl_fixed_component_system',
             ecl_comp_sys,
@@ -682,8 +784,8 @@ def main():
 
     if attributes.get('component') and attributes.get('property') and attributes.get('direct_site'):
         # Get FSN labels for readability
-        comp_fsn = adapter.get_concept_details(attributes['component']).get('fsn', '')
-        site_fsn = adapter.get_concept_details(attributes['direct_site']).get('fsn', '')
+        comp_fsn = _fsn(adapter, attributes['component'])
+        site_fsn = _fsn(adapter, attributes['direct_site'])
 
         # Exp 5: Refined Query V1 (Component + Universal Measurement Property + System)
         ecl_refined_v1 = f"""<< 363787002 |Observable entity| :
@@ -702,8 +804,7 @@ def main():
     if custom_queries_file:
         print(f"\n[CUSTOM] Loading custom ECL queries from {custom_queries_file}...")
         try:
-            with open(custom_queries_file, 'r', encoding='utf-8') as f:
-                custom_queries = json.load(f)
+            custom_queries = load_json(custom_queries_file)
 
             for query in custom_queries.get('queries', []):
                 query_id = query['id']
@@ -729,47 +830,42 @@ def main():
 
     # Extract specimen types
     print("\n[6/6] Extracting specimen types...")
-    all_snomed_concepts = set()
-    for exp in experiments.values():
-        all_snomed_concepts.update(exp['snomed_concepts'])
+    all_snomed_concepts = frozenset().union(*(exp['snomed_concepts'] for exp in experiments.values()))
 
     specimens = extract_specimen_types(loinc_mappings, all_snomed_concepts, adapter)
     print(f"  [OK] Found {len(specimens)} specimen types")
 
     # Fetch LOINC displays
     print("\n[7/7] Fetching LOINC display names...")
-    all_loinc_codes = set(interpolar_codes)
-    for exp in experiments.values():
-        all_loinc_codes.update(exp['loinc_codes'])
+    all_loinc_codes = interpolar_codes.union(*(exp['loinc_codes_set'] for exp in experiments.values()))
 
-    loinc_displays = asyncio.run(fetch_displays_async(sorted(all_loinc_codes), verbose=False))
+    loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(all_loinc_codes), verbose=False))
     print(f"  [OK] Fetched {len(loinc_displays)} displays")
 
-    # Generate HTML dashboard
+    # Generate HTML dashboard - streamed section by section into the output file
     print("\nGenerating HTML dashboard...")
     if binary_output:
         print("  Using binary output (0/1) instead of checkmarks")
-    html = generate_html_dashboard(
-        primary_loinc,
-        component_name,
-        snomed_concept_id,
-        attributes,
-        experiments,
-        interpolar_codes,
-        loinc_displays,
-        specimens,
-        adapter,
-        mii300_codes,
-        binary_output
-    )
 
-    # Save dashboard
     output_dir = project_root / 'output' / 'decision_dashboards'
     output_dir.mkdir(parents=True, exist_ok=True)
 
     output_file = output_dir / f'{component_name}_decision_dashboard.html'
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+        generate_html_dashboard(
+            f.write,
+            primary_loinc,
+            component_name,
+            snomed_concept_id,
+            attributes,
+            experiments,
+            interpolar_codes,
+            loinc_displays,
+            specimens,
+            adapter,
+            mii300_codes,
+            binary_output
+        )
 
     print(f"\n{'=' * 80}")
     print("DASHBOARD GENERATED!")
@@ -777,5 +873,118 @@ def main():
     print(f"\nOutput: {output_file}")
     print(f"\nOpen in browser to review results and make inclusion/exclusion decisions.")
 
+    return output_file
+
+def _run_one(task):
+    """
+    Batch worker: create the dashboard for one primary LOINC.
+
+    create_dashboard() exits on fatal errors; SystemExit is caught here so a
+    failing primary does not stop the other dashboards.
+
+    Returns:
+        tuple (primary_loinc, output_name, success)
+    """
+    primary_loinc, output_name, custom_queries_file, binary_output = task
+    try:
+        create_dashboard(primary_loinc, output_name, custom_queries_file, binary_output)
+        return primary_loinc, output_name, True
+    except (Exception, SystemExit) as e:
+        print(f"ERROR: Dashboard for {primary_loinc} ({output_name}) failed: {e}")
+        return primary_loinc, output_name, False
+
+def run_batch(batch_file, jobs=4, binary_output=False):
+    """
+    Create dashboards for all primaries listed in a CSV file using a thread pool.
+
+    The LOINC mappings, RF2 indexes, Interpolar sheet and adapter are loaded
+    once up front and shared read-only by all threads; the per-dashboard work
+    is dominated by terminology server I/O.
+
+    Args:
+        batch_file: CSV with columns primary_loinc, output_name and optionally custom_queries
+        jobs: Number of dashboards built concurrently
+        binary_output: Use 1/0 instead of checkmarks in the comparison matrix
+
+    Returns:
+        List of (primary_loinc, output_name, success) tuples
+    """
+    tasks = []
+    with open(batch_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        missing_columns = {'primary_loinc', 'output_name'} - set(reader.fieldnames or [])
+        if missing_columns:
+            print(f"ERROR: {batch_file} is missing column(s): {', '.join(sorted(missing_columns))}")
+            sys.exit(1)
+
+        for row in reader:
+            primary_loinc = (row.get('primary_loinc') or '').strip()
+            output_name = (row.get('output_name') or '').strip()
+            if not primary_loinc and not output_name:
+                continue
+            if not primary_loinc or not output_name:
+                print(f"  [SKIP] Line {reader.line_num}: primary_loinc and output_name are both required")
+                continue
+            tasks.append((primary_loinc, output_name,
+                          (row.get('custom_queries') or '').strip() or None, binary_output))
+
+    if not tasks:
+        print(f"ERROR: No primaries found in {batch_file}")
+        sys.exit(1)
+
+    print(f"Preparing shared caches for {len(tasks)} dashboards...")
+    _reverse_index(LOINC_SNOMED_MAPPING_PATH)
+    load_attribute_index(RELATIONSHIP_FILE)
+    _interpolar_sheet()
+    _get_adapter('loincsnomed')
+
+    jobs = max(1, min(jobs, len(tasks)))
+    print(f"Creating {len(tasks)} dashboards with {jobs} threads...")
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(_run_one, tasks))
+
+    failed = [(primary, name) for primary, name, success in results if not success]
+    print(f"\n[OK] Created {len(results) - len(failed)}/{len(results)} dashboards")
+    for primary, name in failed:
+        print(f"  Failed: {primary} ({name})")
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Create an ECL decision dashboard for a primary LOINC code',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python create_decision_dashboard.py 14682-9 creatinine
+  python create_decision_dashboard.py 14682-9 creatinine custom_ecl.json
+  python create_decision_dashboard.py 14682-9 creatinine custom_ecl.json --binary
+
+  # Many primaries in one process (CSV: primary_loinc,output_name[,custom_queries])
+  python create_decision_dashboard.py --batch primaries.csv --jobs 4
+        """
+    )
+    parser.add_argument('primary_loinc', nargs='?', help='Primary LOINC code')
+    parser.add_argument('output_name', nargs='?', help='Output name (e.g., creatinine)')
+    parser.add_argument('custom_queries', nargs='?', help='Optional JSON file with custom ECL queries')
+    parser.add_argument('--binary', action='store_true',
+                        help='Use 1/0 instead of checkmarks in the comparison matrix')
+    parser.add_argument('--batch',
+                        help='CSV file with columns primary_loinc, output_name and optionally custom_queries')
+    parser.add_argument('--jobs', type=int, default=4,
+                        help='Dashboards built concurrently for --batch (default: 4)')
+
+    args = parser.parse_args()
+
+    if args.batch:
+        failed = [r for r in run_batch(args.batch, args.jobs, args.binary) if not r[2]]
+        sys.exit(1 if failed else 0)
+
+    if not args.primary_loinc or not args.output_name:
+        parser.error('primary_loinc and output_name are required unless --batch is given')
+
+    create_dashboard(args.primary_loinc, args.output_name, args.custom_queries, args.binary)
+
 if __name__ == '__main__':
     main()
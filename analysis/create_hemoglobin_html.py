@@ -6,8 +6,10 @@ Generates an HTML table showing all hemoglobin LOINC codes sorted by
 how many approaches found them (most to least).
 """
 
+import numpy as np
 import pandas as pd
-import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Configuration
@@ -18,77 +20,122 @@ REFINED_JSON = PROJECT_ROOT / 'output' / 'singular_concepts' / 'blood_count_hemo
 TOP300_XLSX = PROJECT_ROOT / 'input' / 'Top300 Stand 2018-08-08.xlsx'
 OUTPUT_HTML = PROJECT_ROOT / 'output' / 'singular_concepts' / 'blood_count_hemoglobin' / 'hemoglobin_comparison.html'
 
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+from excel_loader import read_excel_cached
+from json_io import load_json
+
+REFINED_COLUMNS = ['LOINC_Code', 'Excl_Cord_Blood', 'Incl_Cord_Blood',
+                   'hemoglobin_excl_cord_SNOMED', 'hemoglobin_incl_cord_SNOMED']
+
+YES_HTML = "<span class='yes'>✓</span>"
+YES_RECOMMENDED_HTML = "<span class='yes-recommended'>✓</span>"
+
+# Checkmark cells in table column order: (template field, source column, checkmark HTML)
+CHECK_CELLS = [
+    ('interpolar', 'In_Interpolar', YES_HTML),
+    ('descendants', 'ecl_descendants_baseline_Present', YES_HTML),
+    ('fixed_component', 'ecl_fixed_component_Present', YES_HTML),
+    ('component_descendants', 'ecl_component_descendants_Present', YES_HTML),
+    ('fixed_component_property', 'ecl_fixed_component_property_Present', YES_HTML),
+    ('fixed_component_system', 'ecl_fixed_component_system_Present', YES_HTML),
+    ('excl_cord', 'Excl_Cord_Blood', YES_RECOMMENDED_HTML),
+    ('incl_cord', 'Incl_Cord_Blood', YES_HTML),
+]
+
+# 'Yes'/'' flag columns counted per LOINC code; read as categoricals so the
+# comparisons run on integer codes instead of per-cell strings
+APPROACH_COLUMNS = [column for _, column, _ in CHECK_CELLS]
+APPROACH_DTYPES = {column: 'category' for column in APPROACH_COLUMNS}
+
+ROW_TMPL = """
+                <tr>
+                    <td><span class="count">{count}</span></td>
+                    <td><span class="code">{code}</span></td>
+                    <td>{display}</td>
+                    <td style="font-size: 11px; color: #7f8c8d;">{snomed}</td>
+                    <td class="approach-col">{loinc300}</td>
+                    <td class="approach-col">{interpolar}</td>
+                    <td class="approach-col">{descendants}</td>
+                    <td class="approach-col">{fixed_component}</td>
+                    <td class="approach-col">{component_descendants}</td>
+                    <td class="approach-col">{fixed_component_property}</td>
+                    <td class="approach-col">{fixed_component_system}</td>
+                    <td class="approach-col recommended-col">{excl_cord}</td>
+                    <td class="approach-col">{incl_cord}</td>
+                </tr>
+"""
+
+
+def yes_cells(df, column, yes_html):
+    """
+    Map a 'Yes'/'' flag column to checkmark cells in one vectorized pass.
+
+    Returns:
+        Object array with one cell per row (empty if the column is missing)
+    """
+    if column not in df.columns:
+        return np.full(len(df), '', dtype=object)
+    return np.where(df[column].eq('Yes').to_numpy(), yes_html, '').astype(object)
+
+
 print("=" * 80)
 print("CREATING HEMOGLOBIN HTML REPORT")
 print("=" * 80)
 
-# Load detailed comparison
+# The four inputs are independent, so read and parse them in parallel threads
 print("\nLoading comparison data...")
-df = pd.read_csv(INPUT_CSV)
-
-# Load refined ECL results (SNOMED columns as string to preserve IDs)
-df_refined = pd.read_csv(REFINED_CSV, dtype={
-    'hemoglobin_excl_cord_SNOMED': str,
-    'hemoglobin_incl_cord_SNOMED': str
-})
+with ThreadPoolExecutor(max_workers=4) as executor:
+    # Detailed comparison
+    fut_df = executor.submit(pd.read_csv, INPUT_CSV, dtype=APPROACH_DTYPES)
+    # Refined ECL results (SNOMED columns as string to preserve IDs), only the merged columns
+    fut_refined = executor.submit(pd.read_csv, REFINED_CSV, usecols=REFINED_COLUMNS, dtype={
+        **APPROACH_DTYPES,
+        'hemoglobin_excl_cord_SNOMED': str,
+        'hemoglobin_incl_cord_SNOMED': str
+    })
+    # Refined ECL JSON for SNOMED FSN labels
+    fut_json = executor.submit(load_json, REFINED_JSON)
+    # LOINC300 data
+    fut_top300 = executor.submit(read_excel_cached, TOP300_XLSX, usecols=['primär', 'sekundär'])
 
-# Load refined ECL JSON for SNOMED FSN labels
-with open(REFINED_JSON, 'r', encoding='utf-8') as f:
-    refined_json = json.load(f)
+    df = fut_df.result()
+    df_refined = fut_refined.result()
+    refined_json = fut_json.result()
+    df_top300 = fut_top300.result()
 
 # Build LOINC -> SNOMED FSN mapping from excl_cord results
-loinc_to_snomed_fsn = {}
+# (one .get per item; codes without any FSN map to '' just like unmapped codes)
 excl_mapping = refined_json['hemoglobin_excl_cord']['snomed_to_loinc_mapping']
-for loinc_code, snomed_list in excl_mapping.items():
-    fsn_list = [item['snomed_fsn'] for item in snomed_list if item.get('snomed_fsn')]
-    if fsn_list:
-        loinc_to_snomed_fsn[loinc_code] = '<br>'.join(fsn_list)
+loinc_to_snomed_fsn = {
+    loinc_code: '<br>'.join(filter(None, (item.get('snomed_fsn') for item in snomed_list)))
+    for loinc_code, snomed_list in excl_mapping.items()
+}
 
 # Merge the refined ECL columns (including SNOMED mappings)
-df = df.merge(
-    df_refined[['LOINC_Code', 'Excl_Cord_Blood', 'Incl_Cord_Blood',
-                'hemoglobin_excl_cord_SNOMED', 'hemoglobin_incl_cord_SNOMED']],
-    on='LOINC_Code',
-    how='left'
-)
+df = df.merge(df_refined, on='LOINC_Code', how='left', validate='many_to_one')
 
 # Add SNOMED FSN column
 df['SNOMED_FSN'] = df['LOINC_Code'].map(loinc_to_snomed_fsn).fillna('')
 
-# Load LOINC300 data
-print("  Loading LOINC300 data...")
-df_top300 = pd.read_excel(TOP300_XLSX)
-loinc300_codes = set(df_top300['primär'].dropna().unique()) | set(df_top300['sekundär'].dropna().unique())
+# LOINC300 membership
+loinc300_codes = frozenset(pd.concat([df_top300['primär'], df_top300['sekundär']]).dropna().unique())
 df['In_LOINC300'] = df['LOINC_Code'].isin(loinc300_codes)
 print(f"  [OK] Loaded {len(loinc300_codes)} LOINC300 codes")
 
-# Count how many approaches found each code
-approach_columns = [
-    'In_Interpolar',
-    'ecl_descendants_baseline_Present',
-    'ecl_fixed_component_Present',
-    'ecl_component_descendants_Present',
-    'ecl_fixed_component_property_Present',
-    'ecl_fixed_component_system_Present',
-    'Excl_Cord_Blood',
-    'Incl_Cord_Blood'
-]
-
-def count_yes(row):
-    """Count number of 'Yes' values in approach columns."""
-    return sum(1 for col in approach_columns if row.get(col) == 'Yes')
-
-df['Approach_Count'] = df.apply(count_yes, axis=1)
+# Count how many approaches found each code: one vectorized comparison over
+# all approach columns present in the data
+present_approach_columns = [col for col in APPROACH_COLUMNS if col in df.columns]
+df['Approach_Count'] = df[present_approach_columns].eq('Yes').sum(axis=1).astype('int8')
 
 # Sort by approach count (descending), then by LOINC code
-df = df.sort_values(['Approach_Count', 'LOINC_Code'], ascending=[False, True])
+df = df.sort_values(['Approach_Count', 'LOINC_Code'], ascending=[False, True], kind='stable', ignore_index=True)
 
 print(f"  [OK] Loaded {len(df)} LOINC codes")
 
 # Generate HTML
 print("\nGenerating HTML...")
 
-html = """<!DOCTYPE html>
+html_head = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -206,46 +253,30 @@ html = """<!DOCTYPE html>
             <tbody>
 """
 
-# Add rows
-for _, row in df.iterrows():
-    count = row['Approach_Count']
-    loinc_code = row['LOINC_Code']
-    display = row['LOINC_Display']
-    is_primary = row.get('Is_Primary', '')
-
-    # Get SNOMED IDs and FSN labels
-    snomed_ids = row.get('hemoglobin_excl_cord_SNOMED', '')
-    if pd.notna(snomed_ids) and snomed_ids and snomed_ids != 'nan':
-        snomed_id_display = snomed_ids.replace('; ', '<br>')
-    else:
-        snomed_id_display = ''
-
-    snomed_fsn = row.get('SNOMED_FSN', '')
+# Precompute all cells column-wise, then fill the row template once per row
+snomed_ids = df.get('hemoglobin_excl_cord_SNOMED', pd.Series('', index=df.index)).fillna('').astype(str)
+snomed_id_display = snomed_ids.mask(snomed_ids.eq('nan'), '').str.replace('; ', '<br>', regex=False)
+snomed_fsn = df['SNOMED_FSN']
+snomed_combined = snomed_id_display.where(
+    snomed_fsn.eq(''),
+    "<div style='font-family: monospace;'>" + snomed_id_display
+    + "</div><div style='font-size: 10px; color: #95a5a6;'>" + snomed_fsn + "</div>"
+)
 
-    # Combine IDs and labels
-    snomed_combined = f"{snomed_id_display}"
-    if snomed_fsn:
-        snomed_combined = f"<div style='font-family: monospace;'>{snomed_id_display}</div><div style='font-size: 10px; color: #95a5a6;'>{snomed_fsn}</div>"
+row_columns = {
+    'count': df['Approach_Count'].to_numpy(),
+    'code': df['LOINC_Code'].to_numpy(),
+    'display': df['LOINC_Display'].to_numpy(),
+    'snomed': snomed_combined.to_numpy(),
+    'loinc300': np.where(df['In_LOINC300'].to_numpy(dtype=bool), YES_HTML, ''),
+}
+for field, column, yes_html in CHECK_CELLS:
+    row_columns[field] = yes_cells(df, column, yes_html)
 
-    html += f"""
-                <tr>
-                    <td><span class="count">{count}</span></td>
-                    <td><span class="code">{loinc_code}</span></td>
-                    <td>{display}</td>
-                    <td style="font-size: 11px; color: #7f8c8d;">{snomed_combined}</td>
-                    <td class="approach-col">{"<span class='yes'>✓</span>" if row.get('In_LOINC300') else ""}</td>
-                    <td class="approach-col">{"<span class='yes'>✓</span>" if row.get('In_Interpolar') == 'Yes' else ""}</td>
-                    <td class="approach-col">{"<span class='yes'>✓</span>" if row.get('ecl_descendants_baseline_Present') == 'Yes' else ""}</td>
-                    <td class="approach-col">{"<span class='yes'>✓</span>" if row.get('ecl_fixed_component_Present') == 'Yes' else ""}</td>
-                    <td class="approach-col">{"<span class='yes'>✓</span>" if row.get('ecl_component_descendants_Present') == 'Yes' else ""}</td>
-                    <td class="approach-col">{"<span class='yes'>✓</span>" if row.get('ecl_fixed_component_property_Present') == 'Yes' else ""}</td>
-                    <td class="approach-col">{"<span class='yes'>✓</span>" if row.get('ecl_fixed_component_system_Present') == 'Yes' else ""}</td>
-                    <td class="approach-col recommended-col">{"<span class='yes-recommended'>✓</span>" if row.get('Excl_Cord_Blood') == 'Yes' else ""}</td>
-                    <td class="approach-col">{"<span class='yes'>✓</span>" if row.get('Incl_Cord_Blood') == 'Yes' else ""}</td>
-                </tr>
-"""
+fields = list(row_columns)
+format_row = ROW_TMPL.format_map
 
-html += """
+html_tail = """
             </tbody>
         </table>
 
@@ -268,9 +299,11 @@ html += """
 </html>
 """
 
-# Save HTML
-with open(OUTPUT_HTML, 'w', encoding='utf-8') as f:
-    f.write(html)
+# Save HTML, streaming rows straight into a buffered file handle
+with open(OUTPUT_HTML, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+    f.write(html_head)
+    f.writelines(format_row(dict(zip(fields, values))) for values in zip(*row_columns.values()))
+    f.write(html_tail)
 
 print(f"  [OK] Saved HTML report: {OUTPUT_HTML}")
 
@@ -10,10 +10,15 @@ This is focused on reviewing one concept at a time (e.g., hemoglobin, leukocytes
 rather than all concepts together.
 
 Usage:
-    python create_singular_concept_table.py <PRIMARY_LOINC_CODE>
+    python create_singular_concept_table.py <PRIMARY_LOINC_CODE> [<PRIMARY_LOINC_CODE> ...]
+    python create_singular_concept_table.py --primaries <CODE>,<CODE>,...
 
 Example:
     python create_singular_concept_table.py 59260-0
+    python create_singular_concept_table.py --primaries 59260-0,789-8
+
+Several primaries in one call share the parsed Interpolar sheet and ECL
+experiment results instead of re-reading them per concept.
 
 Output:
     - output/singular_concepts/<primary_code>/detailed_comparison.csv
@@ -21,17 +26,21 @@ Output:
 """
 
 import pandas as pd
-import json
 import os
+import functools
 import sys
 import asyncio
+import argparse
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # Add scripts to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
+from excel_loader import read_excel_cached
+from json_io import load_json, dump_json
 
 # Configuration
 INPUT_EXCEL = PROJECT_ROOT / 'input' / 'LOINC_Mapping_Interpolar_v3.6 an Debersthäuser 25.09.2025.xlsx'
@@ -46,11 +55,19 @@ EXPERIMENTS = {
     'ecl_fixed_component_system': PROJECT_ROOT / 'output' / 'ecl_fixed_component_system' / 'comparison_interpolar_vs_ecl.json',
 }
 
+@functools.lru_cache(maxsize=1)
+def _interpolar_sheet():
+    """Interpolar mapping sheet, parsed once per process and shared by all primaries."""
+    return read_excel_cached(
+        INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18,
+        usecols=['LOINC', 'LOINC_PRIMARY', 'GERMAN_NAME_LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY']
+    )
+
 def load_interpolar_data(primary_loinc):
     """Load Interpolar data for a specific primary LOINC code."""
     print(f"\n[1/4] Loading Interpolar data for {primary_loinc}...")
 
-    df = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+    df = _interpolar_sheet()
 
     # Filter for this primary code
     df_primary = df[df['LOINC_PRIMARY'] == primary_loinc].copy()
@@ -80,27 +97,50 @@ def load_interpolar_data(primary_loinc):
         'secondary_codes': secondary_codes
     }
 
+@functools.lru_cache(maxsize=16)
+def _results_by_primary(path, mtime):
+    """
+    Load one ECL experiment result file indexed by primary LOINC code.
+
+    Keyed on the file's mtime, so repeated lookups in one process parse each
+    file once and a regenerated result file is picked up.
+
+    Returns:
+        dict primary LOINC -> result entry
+    """
+    results = load_json(path)
+    return {result['primary_loinc']: result for result in results if result.get('primary_loinc')}
+
+def load_results_by_primary(path):
+    """
+    Load one ECL experiment result file indexed by primary LOINC code.
+
+    Args:
+        path: Path to comparison_interpolar_vs_ecl.json
+
+    Returns:
+        dict primary LOINC -> result entry (shared, do not modify)
+    """
+    return _results_by_primary(path, path.stat().st_mtime)
+
 def load_ecl_experiment_data(primary_loinc):
     """Load ECL experiment results for this primary LOINC."""
     print(f"\n[2/4] Loading ECL experiment results for {primary_loinc}...")
 
     experiment_data = {}
+    existing = {exp_name: path for exp_name, path in EXPERIMENTS.items() if path.exists()}
+
+    # The result files are independent, so read and parse them in parallel
+    with ThreadPoolExecutor(max_workers=max(len(existing), 1)) as executor:
+        indexed = dict(zip(existing, executor.map(load_results_by_primary, existing.values())))
 
-    for exp_name, path in EXPERIMENTS.items():
-        if not path.exists():
+    for exp_name in EXPERIMENTS:
+        if exp_name not in indexed:
             print(f"  [SKIP] {exp_name}: file not found")
-            experiment_data[exp_name] = {'ecl_codes': []}
+            experiment_data[exp_name] = {'ecl_codes': set()}
             continue
 
-        with open(path, 'r', encoding='utf-8') as f:
-            results = json.load(f)
-
-        # Find this primary code's results
-        primary_result = None
-        for result in results:
-            if result.get('primary_loinc') == primary_loinc:
-                primary_result = result
-                break
+        primary_result = indexed[exp_name].get(primary_loinc)
 
         if primary_result:
             ecl_codes = set(primary_result.get('ecl_codes', []))
@@ -123,37 +163,34 @@ def create_comparison_table(interpolar_data, experiment_data):
     secondary_codes = interpolar_data['secondary_codes']
 
     # Collect all unique LOINC codes (from Interpolar + all ECL experiments)
-    all_loinc_codes = set(secondary_codes.keys())
-    all_loinc_codes.add(primary_loinc)
-
-    for exp_name, exp_data in experiment_data.items():
-        all_loinc_codes.update(exp_data['ecl_codes'])
+    all_loinc_codes = {primary_loinc}.union(
+        secondary_codes, *(exp_data['ecl_codes'] for exp_data in experiment_data.values())
+    )
 
     print(f"  Found {len(all_loinc_codes)} unique LOINC codes total")
 
+    loinc_codes = sorted(all_loinc_codes)
+
     # Fetch LOINC display names
     print(f"  Fetching display names...")
-    loinc_displays = asyncio.run(fetch_displays_async(sorted(all_loinc_codes), verbose=False))
-
-    # Build table rows
-    rows = []
-    for loinc_code in sorted(all_loinc_codes):
-        row = {
-            'LOINC_Code': loinc_code,
-            'LOINC_Display': loinc_displays.get(loinc_code, ''),
-            'Is_Primary': 'Yes' if loinc_code == primary_loinc else '',
-            'Interpolar_Comparability': secondary_codes.get(loinc_code, ''),
-            'In_Interpolar': 'Yes' if loinc_code in secondary_codes or loinc_code == primary_loinc else '',
-        }
-
-        # Add columns for each ECL approach
-        for exp_name in EXPERIMENTS.keys():
-            ecl_codes = experiment_data.get(exp_name, {}).get('ecl_codes', set())
-            row[f'{exp_name}_Present'] = 'Yes' if loinc_code in ecl_codes else ''
+    loinc_displays = asyncio.run(fetch_displays_cached_async(loinc_codes, verbose=False))
+
+    # Build the table column by column
+    interpolar_codes = set(secondary_codes) | {primary_loinc}
+    columns = {
+        'LOINC_Code': loinc_codes,
+        'LOINC_Display': [loinc_displays.get(code, '') for code in loinc_codes],
+        'Is_Primary': ['Yes' if code == primary_loinc else '' for code in loinc_codes],
+        'Interpolar_Comparability': [secondary_codes.get(code, '') for code in loinc_codes],
+        'In_Interpolar': ['Yes' if code in interpolar_codes else '' for code in loinc_codes],
+    }
 
-        rows.append(row)
+    # Add columns for each ECL approach
+    for exp_name in EXPERIMENTS.keys():
+        ecl_codes = experiment_data.get(exp_name, {}).get('ecl_codes', set())
+        columns[f'{exp_name}_Present'] = ['Yes' if code in ecl_codes else '' for code in loinc_codes]
 
-    df = pd.DataFrame(rows)
+    df = pd.DataFrame(columns)
 
     print(f"  [OK] Created table with {len(df)} rows, {len(df.columns)} columns")
 
@@ -191,9 +228,9 @@ def create_summary(interpolar_data, experiment_data, df_comparison):
             'interpolar_only_codes': sorted(list(interpolar_set - ecl_codes))
         }
 
-    # Convert pandas int64 to regular int for JSON serialization
-    comparability_counts = pd.Series(secondary_codes.values()).value_counts()
-    comparability_breakdown = {str(k): int(v) for k, v in comparability_counts.items()}
+    # Most frequent comparability level first (same order as value_counts)
+    comparability_counts = Counter(secondary_codes.values()).most_common()
+    comparability_breakdown = {str(k): v for k, v in comparability_counts}
 
     summary = {
         'primary_loinc': primary_loinc,
@@ -211,14 +248,16 @@ def create_summary(interpolar_data, experiment_data, df_comparison):
 
     return summary
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python create_singular_concept_table.py <PRIMARY_LOINC_CODE>")
-        print("\nExample: python create_singular_concept_table.py 59260-0")
-        sys.exit(1)
+def create_singular_table(primary_loinc):
+    """
+    Build and save the comparison table and summary for one primary LOINC.
 
-    primary_loinc = sys.argv[1].strip()
+    Args:
+        primary_loinc: Primary LOINC code (e.g. 59260-0)
 
+    Returns:
+        Output directory, or None if the code is not in the Interpolar mapping
+    """
     print("=" * 80)
     print(f"SINGULAR CONCEPT COMPARISON TABLE")
     print(f"Primary LOINC: {primary_loinc}")
@@ -227,7 +266,7 @@ def main():
     # Load data
     interpolar_data = load_interpolar_data(primary_loinc)
     if not interpolar_data:
-        sys.exit(1)
+        return None
 
     experiment_data = load_ecl_experiment_data(primary_loinc)
 
@@ -245,8 +284,7 @@ def main():
     df_comparison.to_csv(csv_file, index=False)
 
     summary_file = output_dir / 'summary.json'
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+    dump_json(summary, summary_file)
 
     print("\n" + "=" * 80)
     print("COMPLETE!")
@@ -255,5 +293,56 @@ def main():
     print(f"  - detailed_comparison.csv ({len(df_comparison)} rows)")
     print(f"  - summary.json")
 
+    return output_dir
+
+def main_batch(primary_loincs):
+    """
+    Create the tables for several primary LOINC codes in one process.
+
+    The Interpolar sheet and the ECL experiment result files are parsed once
+    and reused for every primary.
+
+    Args:
+        primary_loincs: List of primary LOINC codes
+
+    Returns:
+        List of primary codes that could not be processed
+    """
+    failed = [code for code in primary_loincs if create_singular_table(code) is None]
+
+    if len(primary_loincs) > 1:
+        print(f"\n[OK] Created {len(primary_loincs) - len(failed)}/{len(primary_loincs)} concept tables")
+        if failed:
+            print(f"  Failed: {', '.join(failed)}")
+
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Create comparison tables for single primary LOINC concepts',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python create_singular_concept_table.py 59260-0
+  python create_singular_concept_table.py 59260-0 789-8
+  python create_singular_concept_table.py --primaries 59260-0,789-8
+        """
+    )
+    parser.add_argument('primary_loinc', nargs='*', help='Primary LOINC code(s)')
+    parser.add_argument('--primaries', help='Comma-separated list of primary LOINC codes')
+
+    args = parser.parse_args()
+
+    primary_loincs = [code.strip() for code in args.primary_loinc]
+    if args.primaries:
+        primary_loincs += [code.strip() for code in args.primaries.split(',') if code.strip()]
+
+    if not primary_loincs:
+        parser.error('at least one primary LOINC code is required')
+
+    # Keep the given order, process each code once
+    failed = main_batch(list(dict.fromkeys(primary_loincs)))
+    sys.exit(1 if failed else 0)
+
 if __name__ == '__main__':
     main()
@@ -8,6 +8,12 @@ Extracts Component attribute from SNOMED concepts and builds:
 
 Expected: Near-perfect recall, very poor precision (includes reticulocytes, etc.)
 
+Usage:
+    python ecl_component_descendants_run_all.py [--verbose] [--no-cache]
+
+    --verbose   Print the Component lookup result for every primary code
+    --no-cache  Query the server even for ECL results cached by earlier runs
+
 Dependencies:
 - scripts/ecl_permutation_analyzer_simple.py (from project)
 - scripts/terminology_server_adapters.py (from project)
@@ -15,11 +21,10 @@ Dependencies:
 
 import sys
 import os
-import json
+import asyncio
 import pandas as pd
 import requests
 from pathlib import Path
-from collections import defaultdict
 from datetime import datetime
 
 # Load .env file
@@ -29,8 +34,11 @@ load_dotenv()
 # Set up project paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
-from ecl_permutation_analyzer_simple import load_loinc_mappings, execute_ecl_query
+from ecl_permutation_analyzer_simple import load_loinc_mappings, execute_ecl_queries_async
 from terminology_server_adapters import create_adapter
+from excel_loader import read_excel_cached
+from snomed_rf2_index import load_relationship_index
+from json_io import dump_json
 
 # Configuration - Load from environment
 LOINC_SNOMED_MAPPING_PATH = os.getenv('loinc_snomed_mapping_path')
@@ -51,6 +59,12 @@ INTERPOLAR_VALUESETS_DIR = PROJECT_ROOT / 'output' / 'valuesets'
 # SNOMED relationship IDs
 COMPONENT_ATTRIBUTE_ID = "246093002"  # Component attribute
 
+# Per-primary progress lines only with --verbose
+VERBOSE = '--verbose' in sys.argv[1:]
+
+# ECL results are reused from <project>/.cache/ecl unless --no-cache is given
+USE_ECL_CACHE = '--no-cache' not in sys.argv[1:]
+
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 (OUTPUT_DIR / 'valuesets').mkdir(exist_ok=True)
 
@@ -70,21 +84,11 @@ def load_component_relationships(relationship_file):
         dict mapping concept_id -> component_id
     """
     print(f"  Loading relationships from: {relationship_file}")
-    component_map = {}
-
-    with open(relationship_file, 'r', encoding='utf-8') as f:
-        header = next(f)  # Skip header
-        for line in f:
-            parts = line.strip().split('\t')
-            if len(parts) >= 5:
-                active = parts[2]
-                source_id = parts[4]
-                type_id = parts[7]
-                destination_id = parts[5]
-
-                # Only active Component relationships
-                if active == '1' and type_id == COMPONENT_ATTRIBUTE_ID:
-                    component_map[source_id] = destination_id
+
+    # Parsed and filtered column-wise (pyarrow/pandas C reader, Parquet sidecar)
+    df = load_relationship_index(relationship_file)
+    components = df[df['typeId'] == COMPONENT_ATTRIBUTE_ID]
+    component_map = dict(zip(components['sourceId'], components['destinationId']))
 
     print(f"  [OK] Loaded {len(component_map)} Component relationships")
     return component_map
@@ -102,11 +106,11 @@ loinc_mappings = load_loinc_mappings(LOINC_SNOMED_MAPPING_PATH)
 print(f"  [OK] Loaded {len(loinc_mappings)} LOINC-SNOMED mappings")
 
 # Create reverse mapping: LOINC code → SNOMED concept ID
-loinc_to_snomed = {}
-for snomed_id, data in loinc_mappings.items():
-    loinc_code = data.get('loinc_code')
-    if loinc_code:
-        loinc_to_snomed[loinc_code] = snomed_id
+loinc_to_snomed = {
+    data['loinc_code']: snomed_id
+    for snomed_id, data in loinc_mappings.items()
+    if data.get('loinc_code')
+}
 
 print(f"  [OK] Created reverse lookup for {len(loinc_to_snomed)} LOINC codes")
 
@@ -114,35 +118,31 @@ print(f"  [OK] Created reverse lookup for {len(loinc_to_snomed)} LOINC codes")
 # STEP 2: Read Interpolar and Map to SNOMED
 # ==============================================================================
 print("\n[STEP 2/5] Reading Interpolar mapping and extracting primary codes...")
-df = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+df = read_excel_cached(
+    INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18,
+    usecols=['LOINC', 'LOINC_PRIMARY', 'GERMAN_NAME_LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY']
+)
 df_quantitative = df[df['COMPARABILITY_TO_LOINC_PRIMARY'] == '1 - quantitativ'].copy()
 
-# Group by primary code
-primary_to_secondary = defaultdict(list)
-primary_to_snomed = {}
-primary_to_name = {}
-
-for _, row in df_quantitative.iterrows():
-    loinc = row['LOINC']
-    primary = row['LOINC_PRIMARY']
-    name = row['GERMAN_NAME_LOINC_PRIMARY']
+# Group by primary code (first-seen order of the sheet is kept)
+with_primary = df_quantitative.dropna(subset=['LOINC_PRIMARY'])
 
-    if pd.notna(primary):
-        if primary not in primary_to_name and pd.notna(name):
-            primary_to_name[primary] = name
+named = with_primary.dropna(subset=['GERMAN_NAME_LOINC_PRIMARY']).drop_duplicates('LOINC_PRIMARY')
+primary_to_name = dict(zip(named['LOINC_PRIMARY'], named['GERMAN_NAME_LOINC_PRIMARY']))
 
-        if primary in loinc_to_snomed:
-            primary_to_snomed[primary] = loinc_to_snomed[primary]
-
-    if pd.notna(loinc) and pd.notna(primary):
-        primary_to_secondary[primary].append(loinc)
+primary_to_snomed = {
+    primary: loinc_to_snomed[primary]
+    for primary in with_primary['LOINC_PRIMARY'].unique()
+    if primary in loinc_to_snomed
+}
 
-# Remove duplicates
-for primary in primary_to_secondary:
-    primary_to_secondary[primary] = list(set(primary_to_secondary[primary]))
+# groupby().unique() already removes duplicate secondary codes per primary
+secondary_groups = with_primary.dropna(subset=['LOINC']).groupby('LOINC_PRIMARY', sort=False)['LOINC'].unique()
+primary_to_secondary = {primary: list(codes) for primary, codes in secondary_groups.items()}
 
 print(f"  [OK] Found {len(primary_to_snomed)} primary codes with SNOMED mappings")
-print(f"  [OK] Total Interpolar codes: {sum(len(v) for v in primary_to_secondary.values())}")
+total_interpolar_codes = sum(len(v) for v in primary_to_secondary.values())
+print(f"  [OK] Total Interpolar codes: {total_interpolar_codes}")
 
 # ==============================================================================
 # STEP 3: Extract Component Attributes from SNOMED
@@ -160,8 +160,9 @@ for primary_loinc, snomed_id in primary_to_snomed.items():
         primary_to_component[primary_loinc] = {
             'component_id': component_id
         }
-        print(f"  {primary_loinc} -> Component: {component_id}")
-    else:
+        if VERBOSE:
+            print(f"  {primary_loinc} -> Component: {component_id}")
+    elif VERBOSE:
         print(f"  {primary_loinc} -> No Component found")
 
 print(f"\n  [OK] Extracted Component for {len(primary_to_component)}/{len(primary_to_snomed)} primary codes")
@@ -172,23 +173,22 @@ mapping_output = {
     'summary': {
         'total_primary_codes': len(primary_to_snomed),
         'primary_with_component': len(primary_to_component),
-        'total_interpolar_codes': sum(len(v) for v in primary_to_secondary.values())
+        'total_interpolar_codes': total_interpolar_codes
     },
-    'mappings': {
-        primary: {
-            'loinc_code': primary,
-            'snomed_concept_id': primary_to_snomed[primary],
-            'german_name': primary_to_name.get(primary),
-            'component_id': primary_to_component.get(primary, {}).get('component_id'),
-            'component_fsn': primary_to_component.get(primary, {}).get('component_fsn'),
-            'interpolar_secondary_codes': primary_to_secondary.get(primary, [])
-        }
-        for primary in primary_to_snomed.keys()
-    }
+    'mappings': {}
 }
+for primary, snomed_id in primary_to_snomed.items():
+    component = primary_to_component.get(primary, {})
+    mapping_output['mappings'][primary] = {
+        'loinc_code': primary,
+        'snomed_concept_id': snomed_id,
+        'german_name': primary_to_name.get(primary),
+        'component_id': component.get('component_id'),
+        'component_fsn': component.get('component_fsn'),
+        'interpolar_secondary_codes': primary_to_secondary.get(primary, [])
+    }
 
-with open(OUTPUT_DIR / 'interpolar_loinc_to_snomed_mapping.json', 'w', encoding='utf-8') as f:
-    json.dump(mapping_output, f, indent=2, ensure_ascii=False)
+dump_json(mapping_output, OUTPUT_DIR / 'interpolar_loinc_to_snomed_mapping.json')
 
 print(f"  [OK] Saved: interpolar_loinc_to_snomed_mapping.json")
 
@@ -203,23 +203,28 @@ adapter = create_adapter('loincsnomed')
 print(f"  [OK] Connected to LOINCSNOMED Snowstorm")
 
 ecl_results = {}
-processed = 0
 
-for primary_loinc, component_info in primary_to_component.items():
-    processed += 1
+# Build Component-based ECL (Component DESCENDANTS - includes morphological variants)
+ecl_by_primary = {
+    primary_loinc: f"<< 363787002 |Observable entity| : 246093002 |Component| = <<{component_info['component_id']}"
+    for primary_loinc, component_info in primary_to_component.items()
+}
+
+# Execute all queries concurrently (adaptively bounded), instead of one round-trip after another
+print(f"  Executing {len(ecl_by_primary)} ECL queries (adaptive concurrency)...")
+query_results = asyncio.run(execute_ecl_queries_async(ecl_by_primary, loinc_mappings, limit=1000,
+                                                      server_adapter=adapter, use_cache=USE_ECL_CACHE))
+
+for processed, (primary_loinc, component_info) in enumerate(primary_to_component.items(), 1):
     component_id = component_info['component_id']
+    ecl = ecl_by_primary[primary_loinc]
+    result = query_results[primary_loinc]
 
     print(f"\n  [{processed}/{len(primary_to_component)}] Processing {primary_loinc}")
     print(f"      Name: {primary_to_name.get(primary_loinc, 'N/A')}")
     print(f"      Component: {component_id}")
-
-    # Build Component-based ECL (Component DESCENDANTS - includes morphological variants)
-    ecl = f"<< 363787002 |Observable entity| : 246093002 |Component| = <<{component_id}"
     print(f"      ECL: {ecl}")
 
-    # Execute query
-    result = execute_ecl_query(ecl, loinc_mappings, limit=1000, server_adapter=adapter)
-
     # Extract LOINC codes from results
     ecl_loinc_codes = []
     for concept in result.get('detailed_concepts', []):
@@ -237,7 +242,8 @@ for primary_loinc, component_info in primary_to_component.items():
         'ecl_expression': ecl,
         'snomed_concept_count': result.get('total', 0),
         'loinc_codes_found': ecl_loinc_codes,
-        'execution_time': result.get('execution_time', 0)
+        'execution_time': result.get('execution_time', 0),
+        'cached': result.get('cached', False)
     }
 
     # Create FHIR ValueSet
@@ -267,12 +273,10 @@ for primary_loinc, component_info in primary_to_component.items():
     }
 
     vs_file = OUTPUT_DIR / 'valuesets' / f"valueset-ecl-component-descendants-{primary_loinc.replace('-', '')}.json"
-    with open(vs_file, 'w', encoding='utf-8') as f:
-        json.dump(valueset, f, indent=2, ensure_ascii=False)
+    dump_json(valueset, vs_file)
 
 # Save summary
-with open(OUTPUT_DIR / 'ecl_query_results_summary.json', 'w', encoding='utf-8') as f:
-    json.dump(ecl_results, f, indent=2, ensure_ascii=False)
+dump_json(ecl_results, OUTPUT_DIR / 'ecl_query_results_summary.json')
 
 print(f"\n  [OK] Created {len(ecl_results)} ECL-based value sets")
 print(f"  [OK] Saved: ecl_query_results_summary.json")
@@ -316,8 +320,7 @@ for primary_loinc in primary_to_component.keys():
     })
 
 # Save detailed comparison
-with open(OUTPUT_DIR / 'comparison_interpolar_vs_ecl.json', 'w', encoding='utf-8') as f:
-    json.dump(comparison_results, f, indent=2, ensure_ascii=False)
+dump_json(comparison_results, OUTPUT_DIR / 'comparison_interpolar_vs_ecl.json')
 
 # Create summary CSV
 df_comparison = pd.DataFrame([
@@ -18,7 +18,6 @@ import asyncio
 import pandas as pd
 import requests
 from pathlib import Path
-from collections import defaultdict
 from datetime import datetime
 
 # Load .env file
@@ -30,7 +29,8 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
 from ecl_permutation_analyzer_simple import load_loinc_mappings, execute_ecl_query
 from terminology_server_adapters import create_adapter
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
+from excel_loader import read_excel_cached
 
 # Configuration - Load from environment
 LOINC_SNOMED_MAPPING_PATH = os.getenv('loinc_snomed_mapping_path')
@@ -113,32 +113,27 @@ print(f"  [OK] Created reverse lookup for {len(loinc_to_snomed)} LOINC codes")
 # STEP 2: Read Interpolar and Map to SNOMED
 # ==============================================================================
 print("\n[STEP 2/5] Reading Interpolar mapping and extracting primary codes...")
-df = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
-df_quantitative = df[df['COMPARABILITY_TO_LOINC_PRIMARY'] == '1 - quantitativ'].copy()
-
-# Group by primary code
-primary_to_secondary = defaultdict(list)
-primary_to_snomed = {}
-primary_to_name = {}
-
-for _, row in df_quantitative.iterrows():
-    loinc = row['LOINC']
-    primary = row['LOINC_PRIMARY']
-    name = row['GERMAN_NAME_LOINC_PRIMARY']
-
-    if pd.notna(primary):
-        if primary not in primary_to_name and pd.notna(name):
-            primary_to_name[primary] = name
-
-        if primary in loinc_to_snomed:
-            primary_to_snomed[primary] = loinc_to_snomed[primary]
-
-    if pd.notna(loinc) and pd.notna(primary):
-        primary_to_secondary[primary].append(loinc)
+df = read_excel_cached(
+    INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18,
+    usecols=['LOINC', 'LOINC_PRIMARY', 'GERMAN_NAME_LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY']
+)
+df_quantitative = df[df['COMPARABILITY_TO_LOINC_PRIMARY'] == '1 - quantitativ']
+
+# Group by primary code (first-seen order of the sheet is kept)
+with_primary = df_quantitative.dropna(subset=['LOINC_PRIMARY'])
+
+named = with_primary.dropna(subset=['GERMAN_NAME_LOINC_PRIMARY']).drop_duplicates('LOINC_PRIMARY')
+primary_to_name = dict(zip(named['LOINC_PRIMARY'], named['GERMAN_NAME_LOINC_PRIMARY']))
+
+primary_to_snomed = {
+    primary: loinc_to_snomed[primary]
+    for primary in with_primary['LOINC_PRIMARY'].unique()
+    if primary in loinc_to_snomed
+}
 
-# Remove duplicates
-for primary in primary_to_secondary:
-    primary_to_secondary[primary] = list(set(primary_to_secondary[primary]))
+# groupby().unique() already removes duplicate secondary codes per primary
+secondary_groups = with_primary.dropna(subset=['LOINC']).groupby('LOINC_PRIMARY', sort=False)['LOINC'].unique()
+primary_to_secondary = {primary: list(codes) for primary, codes in secondary_groups.items()}
 
 print(f"  [OK] Found {len(primary_to_snomed)} primary codes with SNOMED mappings")
 print(f"  [OK] Total Interpolar codes: {sum(len(v) for v in primary_to_secondary.values())}")
@@ -243,7 +238,7 @@ for primary_loinc, component_info in primary_to_component.items():
 
 # Fetch all LOINC displays in parallel
 print(f"\n  Fetching display labels for {len(all_ecl_loinc_codes)} unique LOINC codes (in parallel)...")
-loinc_displays = asyncio.run(fetch_displays_async(sorted(all_ecl_loinc_codes), verbose=True, max_concurrent=15))
+loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(all_ecl_loinc_codes), verbose=True, max_concurrent=15))
 
 # Now create FHIR ValueSets with proper display labels
 print(f"\n  Creating FHIR ValueSets with display labels...")
@@ -1,46 +1,38 @@
-import pandas as pd
 import json
 import os
 import sys
 import asyncio
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
 
 # Add the scripts directory to path to import utilities
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 sys.path.insert(0, os.path.join(project_root, 'scripts'))
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
+from excel_loader import read_excel_cached
 
 # Read the Interpolar mapping file
 print("Reading Interpolar mapping file...")
 project_root = Path(__file__).parent.parent.parent.parent
 input_file = project_root / 'input' / 'LOINC_Mapping_Interpolar_v3.6 an Debersthäuser 25.09.2025.xlsx'
-df = pd.read_excel(input_file, sheet_name='LOINC Mapping Interpolar', header=18)
+df = read_excel_cached(
+    input_file, sheet_name='LOINC Mapping Interpolar', header=18,
+    usecols=['LOINC', 'LOINC_PRIMARY', 'GERMAN_NAME_LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY']
+)
 
 # Filter for quantitative comparability only
-df_quantitative = df[df['COMPARABILITY_TO_LOINC_PRIMARY'] == '1 - quantitativ'].copy()
+df_quantitative = df[df['COMPARABILITY_TO_LOINC_PRIMARY'] == '1 - quantitativ']
 
 # Group secondary LOINCs by their primary LOINC
-primary_to_secondary = defaultdict(list)
-primary_to_name = {}
+# (all LOINCs, including the primary itself if it appears in the LOINC column)
+mapped = df_quantitative.dropna(subset=['LOINC', 'LOINC_PRIMARY'])
 
-for _, row in df_quantitative.iterrows():
-    loinc = row['LOINC']
-    primary = row['LOINC_PRIMARY']
-    name = row['GERMAN_NAME_LOINC_PRIMARY']
+named = mapped.dropna(subset=['GERMAN_NAME_LOINC_PRIMARY']).drop_duplicates('LOINC_PRIMARY')
+primary_to_name = dict(zip(named['LOINC_PRIMARY'], named['GERMAN_NAME_LOINC_PRIMARY']))
 
-    if pd.notna(loinc) and pd.notna(primary):
-        # Store the name of the primary code
-        if primary not in primary_to_name and pd.notna(name):
-            primary_to_name[primary] = name
-
-        # Add all LOINCs (including the primary itself if it appears in the LOINC column)
-        primary_to_secondary[primary].append(loinc)
-
-# Remove duplicates
-for primary in primary_to_secondary:
-    primary_to_secondary[primary] = list(set(primary_to_secondary[primary]))
+# groupby().unique() already removes duplicates
+secondary_groups = mapped.groupby('LOINC_PRIMARY', sort=False)['LOINC'].unique()
+primary_to_secondary = {primary: list(codes) for primary, codes in secondary_groups.items()}
 
 print(f"Found {len(primary_to_secondary)} primary LOINC codes")
 print(f"Total secondary mappings: {sum(len(v) for v in primary_to_secondary.values())}")
@@ -52,7 +44,7 @@ for codes in primary_to_secondary.values():
 
 # Fetch all display labels in parallel (async)
 print(f"\nFetching display labels for {len(all_loinc_codes)} unique LOINC codes (in parallel)...")
-loinc_displays = asyncio.run(fetch_displays_async(sorted(all_loinc_codes), verbose=True, max_concurrent=15))
+loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(all_loinc_codes), verbose=True, max_concurrent=15))
 
 # Create output directory
 output_dir = project_root / 'output' / 'valuesets'
@@ -9,19 +9,18 @@ Only includes codes with COMPARABILITY_TO_LOINC_PRIMARY:
 Excludes: "3 - qualitativ", "4 - berechnet", "5 - nein", "unklar"
 """
 
-import pandas as pd
 import json
 import os
 import sys
 import asyncio
 from pathlib import Path
-from collections import defaultdict
 from datetime import datetime
 
 # Add the scripts directory to path to import utilities
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
+from excel_loader import read_excel_cached
 
 # Configuration
 INPUT_EXCEL = PROJECT_ROOT / 'input' / 'LOINC_Mapping_Interpolar_v3.6 an Debersthäuser 25.09.2025.xlsx'
@@ -39,7 +38,10 @@ print("Filter: COMPARABILITY_TO_LOINC_PRIMARY in ['1 - quantitativ', '2 - cutoff
 # STEP 1: Read Excel File
 # ==============================================================================
 print("\n[STEP 1/3] Reading Interpolar mapping Excel file...")
-df = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+df = read_excel_cached(
+    INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18,
+    usecols=['LOINC', 'LOINC_PRIMARY', 'GERMAN_NAME_LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY']
+)
 print(f"  [OK] Loaded {len(df)} total rows")
 
 # ==============================================================================
@@ -56,7 +58,7 @@ for val, count in df['COMPARABILITY_TO_LOINC_PRIMARY'].value_counts().items():
 df_filtered = df[df['COMPARABILITY_TO_LOINC_PRIMARY'].isin([
     '1 - quantitativ',
     '2 - cutoff_Fragestellung'
-])].copy()
+])]
 
 print(f"\n  [OK] After filtering: {len(df_filtered)} rows retained")
 print(f"  [OK] Excluded: {len(df) - len(df_filtered)} rows")
@@ -67,26 +69,14 @@ print(f"  [OK] Excluded: {len(df) - len(df_filtered)} rows")
 print("\n[STEP 3/3] Creating FHIR ValueSets...")
 
 # Group secondary codes by primary code
-primary_to_secondary = defaultdict(list)
-primary_to_name = {}
+with_primary = df_filtered.dropna(subset=['LOINC_PRIMARY'])
 
-for _, row in df_filtered.iterrows():
-    loinc = row['LOINC']
-    primary = row['LOINC_PRIMARY']
-    name = row['GERMAN_NAME_LOINC_PRIMARY']
+named = with_primary.dropna(subset=['GERMAN_NAME_LOINC_PRIMARY']).drop_duplicates('LOINC_PRIMARY')
+primary_to_name = dict(zip(named['LOINC_PRIMARY'], named['GERMAN_NAME_LOINC_PRIMARY']))
 
-    if pd.notna(primary):
-        # Store name
-        if primary not in primary_to_name and pd.notna(name):
-            primary_to_name[primary] = name
-
-        # Add secondary code
-        if pd.notna(loinc):
-            primary_to_secondary[primary].append(loinc)
-
-# Remove duplicates
-for primary in primary_to_secondary:
-    primary_to_secondary[primary] = list(set(primary_to_secondary[primary]))
+# groupby().unique() already removes duplicate secondary codes
+secondary_groups = with_primary.dropna(subset=['LOINC']).groupby('LOINC_PRIMARY', sort=False)['LOINC'].unique()
+primary_to_secondary = {primary: list(codes) for primary, codes in secondary_groups.items()}
 
 print(f"  [OK] Found {len(primary_to_secondary)} unique primary LOINC codes")
 print(f"  [OK] Total secondary codes: {sum(len(v) for v in primary_to_secondary.values())}")
@@ -98,7 +88,7 @@ for codes in primary_to_secondary.values():
 
 # Fetch all display labels in parallel
 print(f"  Fetching display labels for {len(all_loinc_codes)} unique LOINC codes (in parallel)...")
-loinc_displays = asyncio.run(fetch_displays_async(sorted(all_loinc_codes), verbose=True, max_concurrent=15))
+loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(all_loinc_codes), verbose=True, max_concurrent=15))
 
 # Create FHIR ValueSets
 created_count = 0
@@ -28,7 +28,7 @@ from terminology_server_adapters import create_adapter
 # Add local scripts to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
 
 # Configuration
 LOINC_SNOMED_MAPPING_PATH = os.getenv('loinc_snomed_mapping_path')
@@ -116,7 +116,7 @@ all_loinc_codes = set()
 for query_result in results.values():
     all_loinc_codes.update(query_result['loinc_codes'])
 
-loinc_displays = asyncio.run(fetch_displays_async(sorted(all_loinc_codes), verbose=False))
+loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(all_loinc_codes), verbose=False))
 print(f"  [OK] Fetched {len(loinc_displays)} displays")
 
 # Save results
@@ -31,7 +31,7 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
 from ecl_permutation_analyzer_simple import load_loinc_mappings, execute_ecl_query
 from terminology_server_adapters import create_adapter
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
 
 # Configuration
 LOINC_SNOMED_MAPPING_PATH = os.getenv('loinc_snomed_mapping_path')
@@ -116,7 +116,7 @@ all_loinc_codes = set()
 for r in results.values():
     all_loinc_codes.update(r['loinc_codes'])
 
-loinc_displays = asyncio.run(fetch_displays_async(sorted(all_loinc_codes), verbose=False))
+loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(all_loinc_codes), verbose=False))
 print(f"  [OK] Fetched {len(loinc_displays)} displays")
 
 # Compare with Interpolar (load from previous analysis)
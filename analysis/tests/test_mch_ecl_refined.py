@@ -26,7 +26,7 @@ from terminology_server_adapters import create_adapter
 # Add local scripts to path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
 
 # Configuration
 LOINC_SNOMED_MAPPING_PATH = os.getenv('loinc_snomed_mapping_path')
@@ -107,7 +107,7 @@ for query_result in results.values():
 primary_code = '28539-5'
 all_loinc_codes.add(primary_code)
 
-loinc_displays = asyncio.run(fetch_displays_async(sorted(all_loinc_codes), verbose=False))
+loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(all_loinc_codes), verbose=False))
 print(f"  [OK] Fetched {len(loinc_displays)} displays")
 
 # Compare with primary code
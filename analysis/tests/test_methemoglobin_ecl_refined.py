@@ -27,7 +27,8 @@ from terminology_server_adapters import create_adapter
 # Add local scripts to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
+from excel_loader import read_excel_cached
 
 # Configuration
 LOINC_SNOMED_MAPPING_PATH = os.getenv('loinc_snomed_mapping_path')
@@ -86,13 +87,13 @@ print(f"  Result: {result.get('total', 0)} SNOMED concepts -> {len(loinc_codes)}
 
 # Fetch LOINC displays
 print(f"\n[4/4] Fetching LOINC display names...")
-loinc_displays = asyncio.run(fetch_displays_async(sorted(loinc_codes), verbose=False))
+loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(loinc_codes), verbose=False))
 print(f"  [OK] Fetched {len(loinc_displays)} displays")
 
 # Load Interpolar data for comparison
-import pandas as pd
 INPUT_EXCEL = PROJECT_ROOT / 'input' / 'LOINC_Mapping_Interpolar_v3.6 an Debersthäuser 25.09.2025.xlsx'
-df = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+df = read_excel_cached(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18,
+                       usecols=['LOINC', 'LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY'])
 df_quant = df[df['COMPARABILITY_TO_LOINC_PRIMARY'] == '1 - quantitativ'].copy()
 
 # Get methemoglobin interpolar codes
@@ -28,7 +28,8 @@ from terminology_server_adapters import create_adapter
 # Add local scripts to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
+from excel_loader import read_excel_cached
 
 # Configuration
 LOINC_SNOMED_MAPPING_PATH = os.getenv('loinc_snomed_mapping_path')
@@ -150,7 +151,8 @@ else:
 print("\n[5/5] Comparing with Interpolar...")
 import pandas as pd
 INPUT_EXCEL = PROJECT_ROOT / 'input' / 'LOINC_Mapping_Interpolar_v3.6 an Debersthäuser 25.09.2025.xlsx'
-df = pd.read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+df = read_excel_cached(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18,
+                       usecols=['LOINC', 'LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY'])
 df_quant = df[df['COMPARABILITY_TO_LOINC_PRIMARY'] == '1 - quantitativ'].copy()
 
 interpolar_primaries = ['2614-6', '56040-9']
@@ -169,7 +171,7 @@ for approach in ['precoordinated', 'postcoordinated', 'postcoordinated_descendan
 
 # Fetch displays for all codes
 all_codes = precoord_codes | postcoord_codes | postcoord_desc_codes | interpolar_codes
-loinc_displays = asyncio.run(fetch_displays_async(sorted(all_codes), verbose=False))
+loinc_displays = asyncio.run(fetch_displays_cached_async(sorted(all_codes), verbose=False))
 
 # Save results
 results['comparison'] = {
@@ -12,7 +12,7 @@ from datetime import datetime
 # Add the scripts directory to path to import utilities
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root / 'scripts'))
-from loinc_display_fetcher import fetch_displays_async
+from loinc_display_fetcher import fetch_displays_cached_async
 
 # PSA LOINC codes from the ECL component descendants experiment (Exp 2)
 # These are all PSA-related codes found in blood/plasma/serum
@@ -28,7 +28,7 @@ psa_loinc_codes = [
 ]
 
 print(f"Fetching display labels for {len(psa_loinc_codes)} PSA LOINC codes...")
-loinc_displays = asyncio.run(fetch_displays_async(psa_loinc_codes, verbose=True, max_concurrent=15))
+loinc_displays = asyncio.run(fetch_displays_cached_async(psa_loinc_codes, verbose=True, max_concurrent=15))
 
 # Create FHIR ValueSet
 valueset = {
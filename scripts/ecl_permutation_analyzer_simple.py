@@ -19,12 +19,23 @@ import requests
 import json
 import time
 import csv
+import asyncio
+import concurrent.futures
+import hashlib
+import os
 from terminology_server_adapters import create_adapter
 
 # Configuration - can be overridden via command line or config file
 DEFAULT_SERVER_TYPE = "loincsnomed"  # or "ontoserver"
 DEFAULT_SERVER_CONFIG = {}  # Empty for loincsnomed defaults
 
+# Synonym/PT description type as a tab-delimited field, for a cheap substring
+# check before a description line is split
+PT_TYPE_NEEDLE = '\t900000000000013009\t'
+
+# On-disk cache of raw ECL query results (see execute_ecl_query(use_cache=True))
+ECL_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'ecl')
+
 def get_concept_details(concept_id):
     """
     Get full concept details including descriptions and identifiers.
@@ -79,7 +90,8 @@ def load_loinc_mappings(identifier_file, description_file=None):
         with open(identifier_file, 'r') as f:
             next(f)  # Skip header
             for line in f:
-                parts = line.strip().split('\t')
+                # Only the first 6 columns are used - don't split the rest
+                parts = line.rstrip('\r\n').split('\t', 6)
                 if len(parts) >= 6 and parts[2] == '1':  # Active only
                     concept_id = parts[5]
                     loinc_code = parts[0]
@@ -93,7 +105,10 @@ def load_loinc_mappings(identifier_file, description_file=None):
             with open(description_file, 'r') as f:
                 next(f)  # Skip header
                 for line in f:
-                    parts = line.strip().split('\t')
+                    # Only Synonym/PT rows are used - skip all others before splitting
+                    if PT_TYPE_NEEDLE not in line:
+                        continue
+                    parts = line.rstrip('\r\n').split('\t')
                     if len(parts) >= 9 and parts[2] == '1':  # Active
                         concept_id = parts[4]
                         type_id = parts[6]  # FSN=900000000000003001, PT=900000000000013009
@@ -118,7 +133,59 @@ def load_loinc_mappings(identifier_file, description_file=None):
     return mappings
 
 
-def execute_ecl_query(ecl_expression, loinc_mappings=None, limit=1000, server_adapter=None):
+def _ecl_cache_file(server_adapter, ecl_expression, limit):
+    """
+    Return the cache file for an ECL query on a specific server and release.
+
+    The key covers the server endpoint and SNOMED release/branch, the ECL
+    expression and the result limit, so a changed server or release never
+    serves stale results.
+    """
+    server = '|'.join(str(getattr(server_adapter, attr, '')) for attr in
+                      ('api_base', 'branch', 'base_url', 'version_url'))
+    key = '\n'.join([server, ecl_expression, str(limit)])
+    return os.path.join(ECL_CACHE_DIR, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+
+def _cached_server_query(server_adapter, ecl_expression, limit):
+    """
+    Run an ECL query on the server, answering repeated queries from disk.
+
+    Only non-empty results are cached, so failed queries (which the adapters
+    report as empty results) are retried on the next run. The execution time
+    of a cached result is the time spent loading it, and 'cached' is True.
+    """
+    cache_file = _ecl_cache_file(server_adapter, ecl_expression, limit)
+
+    if os.path.exists(cache_file):
+        start = time.time()
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            result['execution_time'] = time.time() - start
+            result['cached'] = True
+            return result
+        except (OSError, ValueError) as e:
+            print("  Warning: Could not read ECL cache {}: {}".format(cache_file, e))
+
+    result = server_adapter.execute_ecl_query(ecl_expression, limit=limit)
+
+    if result.get('items'):
+        try:
+            os.makedirs(ECL_CACHE_DIR, exist_ok=True)
+            # Write to a temporary file first so concurrent readers never see a partial file
+            tmp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({k: v for k, v in result.items() if k != 'execution_time'}, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print("  Warning: Could not write ECL cache {}: {}".format(cache_file, e))
+
+    return result
+
+
+def execute_ecl_query(ecl_expression, loinc_mappings=None, limit=1000, server_adapter=None, verbose=True,
+                      use_cache=False):
     """
     Execute ECL query against SNOMED API and enrich with details.
 
@@ -127,6 +194,8 @@ def execute_ecl_query(ecl_expression, loinc_mappings=None, limit=1000, server_ad
         loinc_mappings: Pre-loaded dict mapping concept_id to LOINC data
         limit: Max results
         server_adapter: TerminologyServerAdapter instance (if None, creates default)
+        verbose: Print progress messages
+        use_cache: Answer repeated queries from the on-disk cache (ECL_CACHE_DIR)
 
     Returns:
         dict with 'total', 'items', 'execution_time', 'detailed_concepts'
@@ -134,13 +203,18 @@ def execute_ecl_query(ecl_expression, loinc_mappings=None, limit=1000, server_ad
     if server_adapter is None:
         server_adapter = create_adapter(DEFAULT_SERVER_TYPE, **DEFAULT_SERVER_CONFIG)
 
-    print("  Executing query...")
+    if verbose:
+        print("  Executing query...")
 
-    result = server_adapter.execute_ecl_query(ecl_expression, limit=limit)
+    if use_cache:
+        result = _cached_server_query(server_adapter, ecl_expression, limit)
+    else:
+        result = server_adapter.execute_ecl_query(ecl_expression, limit=limit)
 
     if result.get('items'):
         # Enrich with FSN and LOINC codes
-        print("  Enriching {} concepts with FSN and LOINC codes...".format(len(result.get('items', []))))
+        if verbose:
+            print("  Enriching {} concepts with FSN and LOINC codes...".format(len(result.get('items', []))))
         detailed_concepts = []
 
         for i, item in enumerate(result.get('items', [])):
@@ -166,7 +240,7 @@ def execute_ecl_query(ecl_expression, loinc_mappings=None, limit=1000, server_ad
             })
 
             # Progress indicator for large sets
-            if (i + 1) % 50 == 0:
+            if verbose and (i + 1) % 50 == 0:
                 print("    Processed {}/{}...".format(i + 1, len(result.get('items', []))))
 
         result['detailed_concepts'] = detailed_concepts
@@ -174,6 +248,57 @@ def execute_ecl_query(ecl_expression, loinc_mappings=None, limit=1000, server_ad
     return result
 
 
+async def execute_ecl_queries_async(ecl_expressions, loinc_mappings=None, limit=1000,
+                                    server_adapter=None, max_concurrent=32, use_cache=False):
+    """
+    Execute many ECL queries concurrently.
+
+    The queries are independent Snowstorm round-trips, so they run on a
+    thread pool (like fetch_displays_async) instead of one after another.
+    How many are actually in flight is decided by the adapter's adaptive
+    concurrency limiter, which backs off when the server reports overload.
+
+    Args:
+        ecl_expressions: dict key -> ECL query string (e.g. primary LOINC -> ECL)
+        loinc_mappings: Pre-loaded dict mapping concept_id to LOINC data
+        limit: Max results per query
+        server_adapter: TerminologyServerAdapter instance shared by all queries
+        max_concurrent: Worker threads, i.e. upper bound of queries in flight (default: 32)
+        use_cache: Answer repeated queries from the on-disk cache (ECL_CACHE_DIR)
+
+    Returns:
+        dict key -> result as returned by execute_ecl_query
+
+    Example:
+        import asyncio
+        results = asyncio.run(execute_ecl_queries_async({'718-7': '<< 1022451000000103'}))
+    """
+    if server_adapter is None:
+        server_adapter = create_adapter(DEFAULT_SERVER_TYPE, **DEFAULT_SERVER_CONFIG)
+
+    if not ecl_expressions:
+        return {}
+
+    loop = asyncio.get_event_loop()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+        futures = [
+            loop.run_in_executor(executor, execute_ecl_query, ecl, loinc_mappings, limit, server_adapter, False,
+                                 use_cache)
+            for ecl in ecl_expressions.values()
+        ]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+    ecl_results = {}
+    for key, result in zip(ecl_expressions, results):
+        if isinstance(result, Exception):
+            print("  Warning: ECL query for {} failed: {}".format(key, result))
+            result = {'items': [], 'total': 0, 'execution_time': 0, 'detailed_concepts': []}
+        ecl_results[key] = result
+
+    return ecl_results
+
+
 def build_ecl_query(component_id, direct_site_id,
                    component_descendants=False, site_descendants=False,
                    exclude_components=None, exclude_sites=None,
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Excel Loader
+============
+Shared helper for reading the Interpolar and Top300 input workbooks.
+
+Uses the Rust-backed calamine engine (python-calamine) when it is installed,
+which parses the workbooks considerably faster than the default openpyxl
+engine. Falls back to openpyxl otherwise.
+
+read_excel_cached() additionally stores the parsed sheet as a Parquet sidecar
+next to the workbook and reuses it while it is newer than the workbook, so
+repeated runs skip Excel parsing entirely.
+
+The sidecar can also be built once up front, e.g. after the workbook was
+updated, so that no experiment script pays for the Excel parse:
+
+    python scripts/excel_loader.py  # Interpolar mapping sheet (default)
+    python scripts/excel_loader.py path/to/workbook.xlsx --sheet 0 --header 0
+
+Usage:
+    from excel_loader import read_excel, read_excel_cached
+
+    df = read_excel(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18)
+    df = read_excel_cached(INPUT_EXCEL, sheet_name='LOINC Mapping Interpolar', header=18,
+                           usecols=['LOINC', 'LOINC_PRIMARY', 'COMPARABILITY_TO_LOINC_PRIMARY'])
+"""
+
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+INTERPOLAR_EXCEL = PROJECT_ROOT / 'input' / 'LOINC_Mapping_Interpolar_v3.6 an Debersthäuser 25.09.2025.xlsx'
+INTERPOLAR_SHEET = 'LOINC Mapping Interpolar'
+INTERPOLAR_HEADER = 18
+
+
+def read_excel(path, **kwargs):
+    """
+    Read an Excel sheet with the fastest available engine.
+
+    Args:
+        path: Path to .xlsx file
+        **kwargs: Passed through to pandas.read_excel
+
+    Returns:
+        DataFrame
+    """
+    kwargs.setdefault('engine', EXCEL_ENGINE)
+    return pd.read_excel(path, **kwargs)
+
+
+def _cache_path(path, sheet_name, header):
+    """Return the Parquet sidecar path for a workbook sheet and header row."""
+    sheet_slug = str(sheet_name).replace(' ', '_')
+    return path.with_name(f'{path.stem}.{sheet_slug}.h{header}.parquet')
+
+
+def _normalize_for_parquet(df):
+    """
+    Make a parsed sheet storable as Parquet.
+
+    Column names become strings and mixed-type object columns (e.g. numbers and
+    text in the same column) are converted to text, keeping missing values.
+    """
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def read_excel_cached(path, sheet_name=0, header=0, usecols=None):
+    """
+    Read an Excel sheet, caching the parsed result as a Parquet sidecar.
+
+    The whole sheet is cached once; usecols only selects the columns that are
+    read back, so scripts needing different columns share the same sidecar.
+
+    Args:
+        path: Path to .xlsx file
+        sheet_name: Sheet name or index
+        header: Row number to use as column names
+        usecols: Optional list of column names to return
+
+    Returns:
+        DataFrame
+    """
+    path = Path(path)
+    cache = _cache_path(path, sheet_name, header)
+
+    if cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+        try:
+            return pd.read_parquet(cache, columns=usecols)
+        except ImportError as e:
+            print(f"  Warning: Cannot read {cache.name} ({e}), parsing Excel file")
+
+    df = _normalize_for_parquet(read_excel(path, sheet_name=sheet_name, header=header))
+
+    try:
+        df.to_parquet(cache, compression='zstd', index=False)
+    except (ImportError, OSError, ValueError, TypeError) as e:
+        print(f"  Warning: Could not write Excel cache {cache.name}: {e}")
+
+    return df[usecols] if usecols is not None else df
+
+
+def main():
+    """Convert a workbook sheet to its Parquet sidecar (command line entry point)."""
+    parser = argparse.ArgumentParser(description='Convert an Excel sheet to the Parquet sidecar used by read_excel_cached()')
+    parser.add_argument('workbook', nargs='?', default=str(INTERPOLAR_EXCEL),
+                        help='Workbook to convert (default: Interpolar mapping)')
+    parser.add_argument('--sheet', default=INTERPOLAR_SHEET,
+                        help='Sheet name or index (default: %(default)s)')
+    parser.add_argument('--header', type=int, default=INTERPOLAR_HEADER,
+                        help='Header row (default: %(default)s)')
+    args = parser.parse_args()
+
+    sheet_name = int(args.sheet) if args.sheet.isdigit() else args.sheet
+    path = Path(args.workbook)
+    if not path.exists():
+        print(f"ERROR: Workbook not found: {path}")
+        raise SystemExit(1)
+
+    df = read_excel_cached(path, sheet_name=sheet_name, header=args.header)
+    cache = _cache_path(path, sheet_name, args.header)
+    if cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+        print(f"[OK] {cache.name}: {len(df)} rows, {len(df.columns)} columns")
+    else:
+        print(f"ERROR: Could not write {cache.name}")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
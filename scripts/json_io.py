@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+JSON I/O
+========
+Shared helpers for reading and writing the JSON artifacts (valuesets,
+experiment results).
+
+Uses orjson when it is installed, which parses and serializes considerably
+faster than the standard library json module. Falls back to json otherwise, so orjson stays
+optional.
+
+Usage:
+    from json_io import load_json, dump_json
+
+    valueset = load_json(vs_file)
+    dump_json(results, output_dir / 'results.json')
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path):
+    """
+    Read and parse a JSON file.
+
+    Args:
+        path: Path to .json file
+
+    Returns:
+        Parsed JSON data
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(data, path):
+    """
+    Write data as indented UTF-8 JSON (indent=2, non-ASCII kept as is).
+
+    Args:
+        data: JSON-serializable data
+        path: Output path
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
@@ -25,12 +25,20 @@ Asynchronous Usage (much faster for many codes):
     import asyncio
 
     displays = asyncio.run(fetch_displays_async(['1920-8', '30239-8', '88112-8']))
+
+Persistent Cache (only fetches codes not seen in earlier runs):
+    from scripts.loinc_display_fetcher import fetch_displays_cached_async
+
+    displays = asyncio.run(fetch_displays_cached_async(['1920-8', '30239-8', '88112-8']))
 """
 
 import os
 import sys
 import asyncio
 import csv
+import sqlite3
+from contextlib import closing
+from datetime import datetime
 from pathlib import Path
 
 # Load .env file
@@ -43,6 +51,7 @@ if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
 from terminology_server_adapters import create_adapter
+from request_throttle import throttled_request
 
 # Get LOINC CSV path from environment
 LOINC_CSV_PATH = os.getenv('loinc_csv_path')
@@ -50,6 +59,9 @@ LOINC_CSV_PATH = os.getenv('loinc_csv_path')
 # Global cache for LOINC CSV data (loaded once per process)
 _LOINC_LOCAL_CACHE = None
 
+# Persistent display cache shared by all scripts (see fetch_displays_cached_async)
+DISPLAY_CACHE_PATH = Path(script_dir).parent / '.cache' / 'loinc_displays.sqlite'
+
 
 def _load_loinc_csv():
     """
@@ -150,7 +162,8 @@ class LOINCDisplayFetcher:
             }
 
             session = self.adapter._get_session()
-            response = session.get(url, params=params)
+            response = throttled_request(session, 'GET', url, self.adapter.limiter,
+                                         rate_limiter=self.adapter.rate_limiter, params=params)
 
             if response.status_code == 200:
                 fhir_response = response.json()
@@ -250,6 +263,12 @@ def fetch_loinc_displays(loinc_codes, base_url=None, verbose=True):
 # Uses asyncio with ThreadPoolExecutor for parallelism while keeping cert auth
 
 import concurrent.futures
+import functools
+
+@functools.lru_cache(maxsize=4)
+def _get_display_adapter(base_url):
+    """Return the OntoServer adapter for base_url, reused across fetch calls."""
+    return create_adapter('ontoserver', base_url=base_url)
 
 def _fetch_single_sync(adapter, loinc_code, local_loinc, verbose=False):
     """
@@ -273,7 +292,8 @@ def _fetch_single_sync(adapter, loinc_code, local_loinc, verbose=False):
         }
 
         session = adapter._get_session()
-        response = session.get(url, params=params)
+        response = throttled_request(session, 'GET', url, adapter.limiter,
+                                     rate_limiter=adapter.rate_limiter, params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -334,8 +354,8 @@ async def fetch_displays_async(loinc_codes, base_url=None, verbose=True, max_con
     # Load local LOINC CSV
     local_loinc = _load_loinc_csv()
 
-    # Create adapter with certificate authentication
-    adapter = create_adapter('ontoserver', base_url=base_url)
+    # Adapter with certificate authentication; its session is shared by all worker threads
+    adapter = _get_display_adapter(base_url)
 
     # Use ThreadPoolExecutor to run lookups in parallel
     loop = asyncio.get_event_loop()
@@ -361,3 +381,100 @@ async def fetch_displays_async(loinc_codes, base_url=None, verbose=True, max_con
 
     return displays
 
+
+
+# ==============================================================================
+# PERSISTENT CACHE - Skips lookups for codes resolved in earlier runs
+# ==============================================================================
+
+# Host parameters per SELECT ... IN (...) (below SQLite's historic limit of 999)
+_CACHE_QUERY_CHUNK = 900
+
+
+def _read_display_cache(cache_path, loinc_codes):
+    """
+    Read the cached displays of the given LOINC codes from the SQLite cache.
+
+    Only the requested codes are selected, so the lookup cost does not grow
+    with the size of the shared cache.
+
+    Returns:
+        Dictionary mapping LOINC code -> display name (empty if no cache yet)
+    """
+    if not cache_path.exists():
+        return {}
+
+    codes = list(dict.fromkeys(loinc_codes))
+    cached = {}
+    try:
+        with closing(sqlite3.connect(cache_path)) as conn:
+            for start in range(0, len(codes), _CACHE_QUERY_CHUNK):
+                chunk = codes[start:start + _CACHE_QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                cached.update(conn.execute(
+                    f"SELECT code, display FROM loinc_displays WHERE code IN ({placeholders})", chunk
+                ))
+        return cached
+    except sqlite3.Error as e:
+        print(f"  Warning: Could not read LOINC display cache {cache_path}: {e}")
+        return {}
+
+
+def _write_display_cache(displays, cache_path):
+    """
+    Store LOINC displays in the SQLite cache in a single transaction.
+
+    Placeholder displays ("LOINC <code>") are not stored, so failed lookups
+    are retried on the next run.
+    """
+    rows = [
+        (code, display, datetime.now().isoformat())
+        for code, display in displays.items()
+        if display != f"LOINC {code}"
+    ]
+    if not rows:
+        return
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(cache_path)) as conn:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS loinc_displays "
+                    "(code TEXT PRIMARY KEY, display TEXT NOT NULL, fetched_at TEXT)"
+                )
+                conn.executemany("INSERT OR REPLACE INTO loinc_displays VALUES (?, ?, ?)", rows)
+    except (sqlite3.Error, OSError) as e:
+        print(f"  Warning: Could not write LOINC display cache {cache_path}: {e}")
+
+
+async def fetch_displays_cached_async(loinc_codes, cache_path=DISPLAY_CACHE_PATH, **kwargs):
+    """
+    Fetch LOINC displays, using a persistent on-disk cache across runs.
+
+    Codes already in the cache are answered locally; only the remaining codes
+    are passed to fetch_displays_async() and then added to the cache.
+
+    Args:
+        loinc_codes: List of LOINC codes
+        cache_path: SQLite cache file (default: <project>/.cache/loinc_displays.sqlite)
+        **kwargs: Passed through to fetch_displays_async (base_url, verbose, max_concurrent)
+
+    Returns:
+        Dictionary mapping LOINC code -> display name
+    """
+    cache_path = Path(cache_path)
+    cached = _read_display_cache(cache_path, loinc_codes)
+
+    displays = {code: cached[code] for code in loinc_codes if code in cached}
+    missing = [code for code in loinc_codes if code not in displays]
+
+    if kwargs.get('verbose', True):
+        print(f"  LOINC display cache: {len(displays)} cached, {len(missing)} to fetch")
+
+    if missing:
+        fetched = await fetch_displays_async(missing, **kwargs)
+        _write_display_cache(fetched, cache_path)
+        displays.update(fetched)
+
+    return displays
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Request Throttling
+==================
+Shared helpers that keep bursts of terminology server requests (concurrent
+ECL queries, display lookups) within what the server sustains.
+
+AdaptiveConcurrencyLimiter bounds the number of requests in flight and
+adjusts that bound like TCP congestion control (AIMD): every successful
+request raises the limit slightly, every overload answer (429/502/503/504)
+cuts it by a fixed fraction. No manual tuning of max_concurrent per server
+is needed; worker pools only have to be large enough for the upper bound.
+
+RateLimiter is a token bucket capping requests per second. shared_rate_limiter()
+returns one bucket per server host, so every adapter and phase of a run (ECL
+queries, concept and display lookups) draws from the same request budget.
+
+Transient failures (overload answers, connection errors, timeouts) are retried
+with exponential backoff and full jitter (retry_with_backoff), so a single 503
+no longer turns into an empty result. Retries go through the same limiters and
+therefore do not amplify an overload.
+
+Usage:
+    from request_throttle import AdaptiveConcurrencyLimiter, shared_rate_limiter, throttled_request
+
+    limiter = AdaptiveConcurrencyLimiter()
+    rate_limiter = shared_rate_limiter(url, os.getenv('SNOWSTORM_QPS'))
+    response = throttled_request(session, 'GET', url, limiter, rate_limiter=rate_limiter, params=params)
+    # retried up to 5 times; raises ServerOverloadError if the server stays overloaded
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+
+# HTTP status codes signalling that the server is overloaded
+OVERLOAD_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Default retry policy for throttled_request
+MAX_TRIES = 5
+BACKOFF_BASE_DELAY = 0.5  # seconds, doubled per attempt
+BACKOFF_MAX_DELAY = 30.0
+
+
+class ServerOverloadError(Exception):
+    """Raised when a server answers with one of OVERLOAD_STATUS_CODES."""
+
+    def __init__(self, status_code, url):
+        super(ServerOverloadError, self).__init__("HTTP {} from {}".format(status_code, url))
+        self.status_code = status_code
+        self.url = url
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Limit concurrent requests with additive increase / multiplicative decrease.
+
+    Thread-safe; one instance is shared by all worker threads talking to the
+    same server.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32, decrease_factor=0.1):
+        """
+        Args:
+            initial: Requests allowed in flight at the start
+            minimum: Lower bound of the limit
+            maximum: Upper bound of the limit
+            decrease_factor: Fraction the limit is cut by on an overload answer
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """Block until a request may be sent, and hold the slot while it runs."""
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def record_success(self):
+        """Additive increase: about +1 per `limit` successful requests."""
+        with self._condition:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._condition.notify_all()
+
+    def record_overload(self):
+        """Multiplicative decrease after an overload answer."""
+        with self._condition:
+            self.limit = max(self.minimum, self.limit * (1.0 - self.decrease_factor))
+
+
+class RateLimiter(object):
+    """
+    Token bucket allowing `rate` requests per second on average.
+
+    Up to `burst` requests may be sent back to back after an idle period. A rate
+    of 0 (or less) disables limiting. Thread-safe.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate: Requests per second (0 = unlimited)
+            burst: Bucket size (default: one second worth of requests, at least 1)
+        """
+        self.rate = float(rate or 0)
+        self.burst = float(burst or max(1.0, self.rate))
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until a request may be sent under the rate limit."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(url, rate):
+    """
+    Return the process-wide RateLimiter for the host of url.
+
+    The first call for a host fixes its rate; later calls (other adapters,
+    other phases of the run) share that bucket.
+
+    Args:
+        url: Any URL on the server
+        rate: Requests per second for the host (0/None/'' = unlimited)
+
+    Returns:
+        RateLimiter
+    """
+    host = urlsplit(url).netloc
+    with _rate_limiters_lock:
+        if host not in _rate_limiters:
+            _rate_limiters[host] = RateLimiter(float(rate or 0))
+        return _rate_limiters[host]
+
+
+def retry_with_backoff(func, retry_on, max_tries=MAX_TRIES,
+                       base_delay=BACKOFF_BASE_DELAY, max_delay=BACKOFF_MAX_DELAY):
+    """
+    Call func(), retrying transient failures with exponential backoff.
+
+    The delay before retry n is drawn uniformly from
+    [0, min(max_delay, base_delay * 2**n)] ("full jitter"), so concurrent
+    workers that failed together do not retry in lockstep.
+
+    Args:
+        func: Callable without arguments
+        retry_on: Exception type or tuple of types to retry on
+        max_tries: Total number of attempts
+        base_delay: Backoff base in seconds
+        max_delay: Upper bound of a single delay in seconds
+
+    Returns:
+        Result of func()
+
+    Raises:
+        The last exception if all attempts failed
+    """
+    for attempt in range(max_tries):
+        try:
+            return func()
+        except retry_on as e:
+            if attempt + 1 >= max_tries:
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            print("  Warning: {}, retrying in {:.1f}s ({}/{})".format(e, delay, attempt + 1, max_tries - 1))
+            time.sleep(delay)
+
+
+# Failures worth retrying: the server or the network may recover
+TRANSIENT_ERRORS = (ServerOverloadError, requests.ConnectionError, requests.Timeout)
+
+
+def _send(session, method, url, limiter, rate_limiter, kwargs):
+    """Send one request through the limiters (single attempt)."""
+    # Wait for a token before taking a slot, so waiting never blocks a slot
+    if rate_limiter is not None:
+        rate_limiter.wait()
+
+    with limiter.slot():
+        response = session.request(method, url, **kwargs)
+
+    if response.status_code in OVERLOAD_STATUS_CODES:
+        limiter.record_overload()
+        raise ServerOverloadError(response.status_code, url)
+
+    limiter.record_success()
+    return response
+
+
+def throttled_request(session, method, url, limiter, rate_limiter=None, max_tries=MAX_TRIES, **kwargs):
+    """
+    Send one request through the rate limiter and adaptive concurrency limiter.
+
+    Overload answers, connection errors and timeouts are retried with
+    exponential backoff (see retry_with_backoff).
+
+    Args:
+        session: requests session to send with
+        method: HTTP method ('GET', 'POST', ...)
+        url: Request URL
+        limiter: AdaptiveConcurrencyLimiter shared by all requests to the server
+        rate_limiter: Optional RateLimiter (requests per second) for the server
+        max_tries: Total number of attempts (default: MAX_TRIES)
+        **kwargs: Passed through to session.request
+
+    Returns:
+        requests.Response (any status except the overload codes)
+
+    Raises:
+        ServerOverloadError: if the server still answered 429/502/503/504 on the last attempt
+        requests.ConnectionError, requests.Timeout: if the last attempt failed with them
+    """
+    return retry_with_backoff(
+        lambda: _send(session, method, url, limiter, rate_limiter, kwargs),
+        TRANSIENT_ERRORS,
+        max_tries=max_tries
+    )
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+SNOMED RF2 Snapshot Index
+=========================
+Cached lookups over the SNOMED RF2 snapshot files of the LOINC Extension.
+
+The relationship snapshot is several hundred MB, but the analysis scripts only
+ever consult active Component, Property and Direct site relationships. This
+module parses the file once, keeps just those rows and persists them as a
+Parquet sidecar next to the source file. Later runs read the sidecar instead
+of the TSV as long as it is newer than the snapshot.
+
+load_fsn_index() does the same for the description snapshot: one pass over
+the file builds a concept ID -> Fully Specified Name dict, with the active FSN
+rows persisted as a .fsn.parquet sidecar.
+
+Usage:
+    from snomed_rf2_index import load_relationship_index, load_attribute_index, load_fsn_index
+
+    df = load_relationship_index(relationship_file)
+    df[df['sourceId'] == '168331010000106']
+
+    load_attribute_index(relationship_file).get('168331010000106', {})
+    # {'component': ..., 'property': ..., 'direct_site': ...}
+
+    fsn_index = load_fsn_index(description_file)
+    fsn_index.get('168331010000106')
+"""
+
+import csv
+import functools
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# SNOMED attribute IDs
+COMPONENT_ATTRIBUTE_ID = "246093002"
+PROPERTY_ATTRIBUTE_ID = "370130000"
+DIRECT_SITE_ATTRIBUTE_ID = "704327008"
+
+ATTRIBUTE_TYPE_IDS = (COMPONENT_ATTRIBUTE_ID, PROPERTY_ATTRIBUTE_ID, DIRECT_SITE_ATTRIBUTE_ID)
+ATTRIBUTE_KEYS = {
+    COMPONENT_ATTRIBUTE_ID: 'component',
+    PROPERTY_ATTRIBUTE_ID: 'property',
+    DIRECT_SITE_ATTRIBUTE_ID: 'direct_site'
+}
+
+RELATIONSHIP_COLUMNS = ['active', 'sourceId', 'destinationId', 'typeId']
+
+FSN_TYPE_ID = "900000000000003001"
+DESCRIPTION_COLUMNS = ['active', 'conceptId', 'typeId', 'term']
+
+
+def _sidecar_is_fresh(sidecar, source_file):
+    """Return True if the sidecar exists and is not older than its source file."""
+    return sidecar.exists() and sidecar.stat().st_mtime >= source_file.stat().st_mtime
+
+
+def _read_active_rows(rf2_file, columns, type_ids):
+    """
+    Read the active rows of an RF2 snapshot file with one of the given typeIds.
+
+    Uses the multithreaded pyarrow CSV reader when pyarrow is installed and
+    filters in Arrow before converting to pandas; falls back to the pandas
+    C parser otherwise. Quoting is disabled, as RF2 terms may contain quotes.
+
+    Args:
+        rf2_file: Path to an RF2 snapshot file
+        columns: Columns to read, including 'active' and 'typeId'
+        type_ids: typeIds to keep
+
+    Returns:
+        DataFrame with the requested columns except 'active' (all str)
+    """
+    keep_columns = [col for col in columns if col != 'active']
+
+    if pa is not None:
+        table = pa_csv.read_csv(
+            rf2_file,
+            parse_options=pa_csv.ParseOptions(delimiter='\t', quote_char=False),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={col: pa.int8() if col == 'active' else pa.string() for col in columns}
+            )
+        )
+        mask = pc.and_(pc.equal(table['active'], 1), pc.is_in(table['typeId'], value_set=pa.array(type_ids)))
+        return table.filter(mask).select(keep_columns).to_pandas()
+
+    df = pd.read_csv(
+        rf2_file,
+        sep='\t',
+        usecols=columns,
+        dtype={col: 'int8' if col == 'active' else str for col in columns},
+        quoting=csv.QUOTE_NONE,
+        engine='c'
+    )
+    mask = (df['active'] == 1) & df['typeId'].isin(type_ids)
+    return df.loc[mask, keep_columns].reset_index(drop=True)
+
+
+@functools.lru_cache(maxsize=4)
+def load_relationship_index(relationship_file):
+    """
+    Load active Component/Property/Direct site relationships.
+
+    Args:
+        relationship_file: Path to sct2_Relationship_Snapshot_*.txt
+
+    Returns:
+        DataFrame with 'sourceId', 'destinationId', 'typeId' columns (all str)
+    """
+    relationship_file = Path(relationship_file)
+    sidecar = relationship_file.with_suffix('.attrs.parquet')
+
+    if _sidecar_is_fresh(sidecar, relationship_file):
+        try:
+            return pd.read_parquet(sidecar)
+        except ImportError as e:
+            print(f"  Warning: Cannot read {sidecar.name} ({e}), parsing relationship file")
+
+    df = _read_active_rows(relationship_file, RELATIONSHIP_COLUMNS, ATTRIBUTE_TYPE_IDS)
+
+    try:
+        df.to_parquet(sidecar, compression='zstd', index=False)
+    except (ImportError, OSError) as e:
+        print(f"  Warning: Could not write relationship cache {sidecar.name}: {e}")
+
+    return df
+
+
+@functools.lru_cache(maxsize=4)
+def load_attribute_index(relationship_file):
+    """
+    Map each concept to its Component, Property and Direct site attributes.
+
+    Built once from the relationship index, so looking up the attributes of
+    any number of concepts is a dict access.
+
+    Args:
+        relationship_file: Path to sct2_Relationship_Snapshot_*.txt
+
+    Returns:
+        dict concept ID -> dict with 'component', 'property', 'direct_site' keys
+        (only the attributes the concept has)
+    """
+    df = load_relationship_index(relationship_file)
+
+    index = {}
+    for source_id, type_id, destination_id in zip(df['sourceId'], df['typeId'], df['destinationId']):
+        index.setdefault(source_id, {})[ATTRIBUTE_KEYS[type_id]] = destination_id
+
+    return index
+
+
+@functools.lru_cache(maxsize=4)
+def load_fsn_index(description_file):
+    """
+    Load the Fully Specified Names of all concepts in one pass.
+
+    Args:
+        description_file: Path to sct2_Description_Snapshot-en_*.txt
+
+    Returns:
+        dict concept ID -> FSN term (active FSN descriptions only)
+    """
+    description_file = Path(description_file)
+    sidecar = description_file.with_suffix('.fsn.parquet')
+
+    if _sidecar_is_fresh(sidecar, description_file):
+        try:
+            df = pd.read_parquet(sidecar)
+            return dict(zip(df['conceptId'], df['term']))
+        except ImportError as e:
+            print(f"  Warning: Cannot read {sidecar.name} ({e}), parsing description file")
+
+    df = _read_active_rows(description_file, DESCRIPTION_COLUMNS, (FSN_TYPE_ID,))[['conceptId', 'term']]
+
+    try:
+        df.to_parquet(sidecar, compression='zstd', index=False)
+    except (ImportError, OSError) as e:
+        print(f"  Warning: Could not write FSN cache {sidecar.name}: {e}")
+
+    return dict(zip(df['conceptId'], df['term']))
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Table I/O
+=========
+Shared helper for writing intermediate result tables.
+
+write_table() writes the CSV as before and additionally a Parquet copy next
+to it (same name, .parquet suffix), which later Python stages can load much
+faster than the CSV. The Parquet copy is optional: without pyarrow only the
+CSV is written.
+
+Usage:
+    from table_io import write_table
+
+    write_table(df_summary, OUTPUT_DIR / 'cbc_summary.csv')
+    # -> cbc_summary.csv + cbc_summary.parquet
+"""
+
+from pathlib import Path
+
+
+def write_table(df, csv_path):
+    """
+    Write a DataFrame as CSV plus a Parquet copy with the same stem.
+
+    Args:
+        df: DataFrame to write
+        csv_path: Output .csv path
+
+    Returns:
+        Path of the Parquet copy, or None if it could not be written
+    """
+    csv_path = Path(csv_path)
+    df.to_csv(csv_path, index=False)
+
+    parquet_path = csv_path.with_suffix('.parquet')
+    try:
+        df.to_parquet(parquet_path, index=False)
+    except (ImportError, OSError, ValueError, TypeError) as e:
+        print(f"  Warning: Could not write {parquet_path.name}: {e}")
+        return None
+
+    return parquet_path
@@ -12,6 +12,7 @@ changing the core query logic.
 
 import time
 import os
+import threading
 from pathlib import Path
 import getpass
 
@@ -24,6 +25,13 @@ except ImportError:
     print("Warning: python-dotenv not installed, environment variables must be set manually")
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from request_throttle import AdaptiveConcurrencyLimiter, shared_rate_limiter, throttled_request
+
+# Connections kept per host in a shared session (covers concurrent display lookups
+# and ECL queries)
+SESSION_POOL_MAXSIZE = 32
 
 try:
     from requests_pkcs12 import Pkcs12Adapter
@@ -70,10 +78,28 @@ class TerminologyServerAdapter(object):
         """
         raise NotImplementedError("Subclasses must implement get_concept_details")
 
+    def get_concepts_details(self, concept_ids):
+        """
+        Get concept details for several concepts.
+
+        The default implementation looks up one concept at a time; adapters
+        whose server supports bulk lookups override it.
+
+        Args:
+            concept_ids: Iterable of SNOMED concept IDs
+
+        Returns:
+            dict concept ID -> dict with 'concept_id', 'fsn', 'pt'
+        """
+        return {concept_id: self.get_concept_details(concept_id) for concept_id in dict.fromkeys(concept_ids)}
+
 
 class LOINCSNOMEDSnowstormAdapter(TerminologyServerAdapter):
     """Adapter for LOINCSNOMED public Snowstorm instance."""
 
+    # Concept IDs per bulk /concepts request (keeps the query string short)
+    CONCEPT_BATCH_SIZE = 100
+
     def __init__(self, api_base=None, branch=None):
         """
         Initialize LOINCSNOMED adapter.
@@ -85,6 +111,38 @@ class LOINCSNOMEDSnowstormAdapter(TerminologyServerAdapter):
         self.api_base = api_base or "http://browser.loincsnomed.org/snowstorm/snomed-ct"
         self.branch = branch or "MAIN/LOINC/2025-09-21"
 
+        # Shared session, created on first use (see _get_session)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+        # Requests in flight, adapted to the server's overload answers, and an
+        # optional requests-per-second budget shared by everything talking to the host
+        self.limiter = AdaptiveConcurrencyLimiter()
+        self.rate_limiter = shared_rate_limiter(self.api_base, os.getenv('SNOWSTORM_QPS'))
+
+    def _get(self, url, params=None):
+        """GET through the shared session, the rate limiter and the concurrency limiter."""
+        return throttled_request(self._get_session(), 'GET', url, self.limiter,
+                                 rate_limiter=self.rate_limiter, params=params)
+
+    def _get_session(self):
+        """
+        Return the adapter's requests session, creating it on first use.
+
+        All requests of this adapter, including concurrent ECL queries from
+        worker threads, reuse its keep-alive connection pool instead of opening
+        a new connection per request.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    pool = HTTPAdapter(pool_maxsize=SESSION_POOL_MAXSIZE)
+                    session.mount('http://', pool)
+                    session.mount('https://', pool)
+                    self._session = session
+        return self._session
+
     def execute_ecl_query(self, ecl_expression, limit=1000):
         """Execute ECL query against LOINCSNOMED Snowstorm."""
         url = "{}/{}/concepts".format(self.api_base, self.branch)
@@ -97,7 +155,7 @@ class LOINCSNOMEDSnowstormAdapter(TerminologyServerAdapter):
         start_time = time.time()
 
         try:
-            response = requests.get(url, params=params)
+            response = self._get(url, params=params)
             execution_time = time.time() - start_time
 
             if response.status_code == 200:
@@ -116,7 +174,7 @@ class LOINCSNOMEDSnowstormAdapter(TerminologyServerAdapter):
         url = "{}/{}/concepts/{}".format(self.api_base, self.branch, concept_id)
 
         try:
-            response = requests.get(url)
+            response = self._get(url)
             if response.status_code == 200:
                 data = response.json()
 
@@ -138,6 +196,42 @@ class LOINCSNOMEDSnowstormAdapter(TerminologyServerAdapter):
             print("    Warning: Could not get details for {}: {}".format(concept_id, str(e)))
             return {'concept_id': concept_id, 'fsn': 'Unknown', 'pt': 'Unknown'}
 
+    def get_concepts_details(self, concept_ids):
+        """
+        Get concept details for several concepts with bulk /concepts requests.
+
+        Concepts are requested in batches of CONCEPT_BATCH_SIZE via the
+        conceptIds filter. Concepts missing from a bulk response (or batches
+        that fail) fall back to single get_concept_details() lookups.
+        """
+        concept_ids = list(dict.fromkeys(concept_ids))
+        url = "{}/{}/concepts".format(self.api_base, self.branch)
+        details = {}
+
+        for i in range(0, len(concept_ids), self.CONCEPT_BATCH_SIZE):
+            batch = concept_ids[i:i + self.CONCEPT_BATCH_SIZE]
+            params = {"conceptIds": batch, "limit": len(batch)}
+
+            try:
+                response = self._get(url, params=params)
+                if response.status_code == 200:
+                    for item in response.json().get('items', []):
+                        details[item['conceptId']] = {
+                            'concept_id': item['conceptId'],
+                            'fsn': item.get('fsn', {}).get('term', 'Unknown'),
+                            'pt': item.get('pt', {}).get('term', 'Unknown')
+                        }
+                else:
+                    print("    Warning: Bulk concept lookup failed: {}".format(response.status_code))
+            except Exception as e:
+                print("    Warning: Bulk concept lookup failed: {}".format(str(e)))
+
+        for concept_id in concept_ids:
+            if concept_id not in details:
+                details[concept_id] = self.get_concept_details(concept_id)
+
+        return details
+
 
 class OntoServerAdapter(TerminologyServerAdapter):
     """Adapter for OntoServer FHIR terminology server."""
@@ -182,12 +276,36 @@ class OntoServerAdapter(TerminologyServerAdapter):
         self.cert_path = cert_path
         self.cert_password = cert_password
 
+        # Shared session, created on first use (see _get_session)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+        # Requests in flight, adapted to the server's overload answers, and an
+        # optional requests-per-second budget shared by everything talking to the host
+        self.limiter = AdaptiveConcurrencyLimiter()
+        self.rate_limiter = shared_rate_limiter(self.base_url, os.getenv('ONTOSERVER_QPS'))
+
     def _get_session(self):
+        """
+        Return the adapter's requests session, creating it on first use.
+
+        The session (certificate loading and connection pool) is reused for all
+        requests of this adapter, including concurrent requests from worker
+        threads, instead of being rebuilt for every request.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
         """
         Create a requests session with certificate authentication.
         Returns a session configured for mTLS if certificate is available.
         """
         session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_maxsize=SESSION_POOL_MAXSIZE))
 
         if not HAS_PKCS12:
             print("  Warning: requests-pkcs12 not available, using standard session (authentication will fail)")
@@ -245,7 +363,8 @@ class OntoServerAdapter(TerminologyServerAdapter):
                     # If legacy approach fails, try Pkcs12Adapter
                     adapter = Pkcs12Adapter(
                         pkcs12_filename=self.cert_path,
-                        pkcs12_password=self.cert_password
+                        pkcs12_password=self.cert_password,
+                        pool_maxsize=SESSION_POOL_MAXSIZE
                     )
                     session.mount('https://', adapter)
                     return session
@@ -297,7 +416,8 @@ class OntoServerAdapter(TerminologyServerAdapter):
                 headers = {"Content-Type": "application/json"}
                 params = {"count": limit}
 
-                response = session.post(url, json=valueset_body, params=params, headers=headers)
+                response = throttled_request(session, 'POST', url, self.limiter, rate_limiter=self.rate_limiter,
+                                             json=valueset_body, params=params, headers=headers)
             else:
                 # Method 1: GET with fhir_vs parameter
                 # The fhir_vs is part of the url parameter value, not a separate parameter
@@ -308,7 +428,8 @@ class OntoServerAdapter(TerminologyServerAdapter):
                     "count": limit
                 }
 
-                response = session.get(url, params=params)
+                response = throttled_request(session, 'GET', url, self.limiter,
+                                             rate_limiter=self.rate_limiter, params=params)
 
             execution_time = time.time() - start_time
 
@@ -372,7 +493,8 @@ class OntoServerAdapter(TerminologyServerAdapter):
 
         try:
             session = self._get_session()
-            response = session.get(url, params=params)
+            response = throttled_request(session, 'GET', url, self.limiter,
+                                         rate_limiter=self.rate_limiter, params=params)
 
             if response.status_code == 200:
                 fhir_response = response.json()